@@ -1,14 +1,29 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from flask_cors import CORS
-from marshmallow import Schema, fields, ValidationError
+from marshmallow import Schema, fields, validate, ValidationError
 from datetime import datetime, timedelta
 import os
+import logging
 import random
 import json
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 import uuid
-from osint_collector import collect_vendor_osint
+from osint_collector import (PORT_PROFILES, PROBE_PROFILES, PROBE_REGISTRY, OSINTCollector, backed_score_keys, collect_vendor_osint,
+                             collect_bulk_vendor_osint, iter_bulk_vendor_osint)
+from osint_cache import OSINTResultCache
+from osint_metrics import get_default_metrics
+from osint_scoring import SCORE_NAMES, batch_calculate_scores
+from risk_calculator import AdvancedRiskCalculator, RiskCalculator, assess_vendor_batch
+from osint_singleflight import SingleFlight, default_lock_dir
+from pagination import InvalidCursorError, KeysetPage, approximate_count, keyset_paginate
+from stats_cache import StatsCache
+from vendor_import import FastRowValidator, ImportFormatError, copy_text_rows, import_format, iter_import_rows
 # Try to import vendor report, but handle missing dependencies gracefully
 try:
     from vendor_report import generate_vendor_report
@@ -21,6 +36,8 @@ except ImportError as e:
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
 # Database configuration
@@ -31,17 +48,147 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 CORS(app)
 
+# Dashboard aggregates, invalidated when client data changes and expired after a TTL
+stats_cache = StatsCache(ttl=float(os.getenv('DASHBOARD_STATS_TTL', 60)))
+
+# OSINT probe results shared by all OSINT endpoints in this process
+osint_cache = OSINTResultCache(max_entries=int(os.getenv('OSINT_CACHE_MAX_ENTRIES', 1000)))
+
+# Concurrent collections of the same domain share one run, across threads and gunicorn workers
+osint_single_flight = SingleFlight(
+    lock_dir=default_lock_dir() if os.getenv('OSINT_CROSS_WORKER_COALESCING', 'true').lower() == 'true' else None
+)
+
+# Upper bound in seconds on one interactive OSINT collection, kept under gunicorn's 30s worker timeout
+OSINT_COLLECTION_DEADLINE = float(os.getenv('OSINT_COLLECTION_DEADLINE', 25))
+
+# Bulk OSINT collection limits
+OSINT_BULK_MAX_WORKERS = int(os.getenv('OSINT_BULK_MAX_WORKERS', 8))
+OSINT_DOMAIN_TIMEOUT = float(os.getenv('OSINT_DOMAIN_TIMEOUT', 60))
+osint_concurrency_limit = threading.BoundedSemaphore(int(os.getenv('OSINT_MAX_CONCURRENT_COLLECTIONS', 16)))
+# Most domains accepted by one bulk collection, and by one background job
+OSINT_BULK_MAX_DOMAINS = int(os.getenv('OSINT_BULK_MAX_DOMAINS', 1000))
+OSINT_JOB_MAX_DOMAINS = int(os.getenv('OSINT_JOB_MAX_DOMAINS', 10000))
+
+# Background OSINT job settings
+OSINT_JOB_POLL_INTERVAL = float(os.getenv('OSINT_JOB_POLL_INTERVAL', 2))
+OSINT_JOB_STALE_SECONDS = float(os.getenv('OSINT_JOB_STALE_SECONDS', 300))
+OSINT_JOB_RUNNER_ENABLED = os.getenv('OSINT_JOB_RUNNER_ENABLED', 'true').lower() == 'true'
+
+def refresh_requested():
+    """Whether the caller asked to bypass cached OSINT results"""
+    return request.args.get('refresh', 'false').lower() in ('1', 'true', 'yes')
+
+def stream_requested(data):
+    """Whether the caller asked for an NDJSON response: "stream": true in the body, ?stream=, or the Accept header"""
+    return (data.get('stream') is True
+            or request.args.get('stream', 'false').lower() in ('1', 'true', 'yes')
+            or request.accept_mimetypes.best == 'application/x-ndjson')
+
+def collection_deadline():
+    """Per-request OSINT collection budget from ?deadline=, capped at OSINT_COLLECTION_DEADLINE"""
+    try:
+        deadline = float(request.args.get('deadline', OSINT_COLLECTION_DEADLINE))
+    except ValueError:
+        deadline = OSINT_COLLECTION_DEADLINE
+    return max(1.0, min(deadline, OSINT_COLLECTION_DEADLINE))
+
+def probe_profile(data=None):
+    """Requested probe profile from ?profile= or the request body, "full" by default"""
+    return request.args.get('profile') or (data or {}).get('profile') or 'full'
+
+def unknown_profile_response(profile):
+    """400 response for a probe profile that does not exist, or None"""
+    if isinstance(profile, str) and profile in PROBE_PROFILES:
+        return None
+    return jsonify({'error': f'Unknown probe profile: {profile}', 'profiles': list(PROBE_PROFILES)}), 400
+
+def requested_osint_options(data):
+    """
+    (options, None) with the validated bulk collection options of a request body, or (None, 400 response)
+    
+    Only options present in the body are returned, normalized: max_workers a
+    positive int, domain_timeout a positive number of seconds, refresh a
+    JSON boolean, plus the probe and port scan profiles (from ?profile= and
+    ?port_profile=, or the body).
+    """
+    options = {}
+    if 'max_workers' in data:
+        value = data['max_workers']
+        if type(value) is not int or value < 1:
+            return None, (jsonify({'error': 'max_workers must be a positive integer'}), 400)
+        options['max_workers'] = value
+    if 'domain_timeout' in data:
+        value = data['domain_timeout']
+        if type(value) not in (int, float) or not 0 < value < float('inf'):
+            return None, (jsonify({'error': 'domain_timeout must be a positive number of seconds'}), 400)
+        options['domain_timeout'] = float(value)
+    if 'refresh' in data:
+        if not isinstance(data['refresh'], bool):
+            return None, (jsonify({'error': 'refresh must be true or false'}), 400)
+        options['refresh'] = data['refresh']
+    options['profile'] = probe_profile(data)
+    invalid = unknown_profile_response(options['profile'])
+    if invalid:
+        return None, invalid
+    options['port_profile'] = port_scan_profile(data)
+    invalid = unknown_port_profile_response(options['port_profile'])
+    if invalid:
+        return None, invalid
+    return options, None
+
+def port_scan_profile(data=None):
+    """Requested port scan profile from ?port_profile= or the request body, "common" by default"""
+    return request.args.get('port_profile') or (data or {}).get('port_profile') or 'common'
+
+def unknown_port_profile_response(port_profile):
+    """400 response for a port scan profile that does not exist, or None"""
+    if isinstance(port_profile, str) and port_profile in PORT_PROFILES:
+        return None
+    return jsonify({'error': f'Unknown port profile: {port_profile}', 'port_profiles': list(PORT_PROFILES)}), 400
+
+def bulk_osint_options(data):
+    """Keyword arguments for bulk OSINT collection from options checked by requested_osint_options"""
+    return {
+        'max_workers': min(int(data.get('max_workers', OSINT_BULK_MAX_WORKERS)), OSINT_BULK_MAX_WORKERS),
+        'domain_timeout': min(float(data.get('domain_timeout', OSINT_DOMAIN_TIMEOUT)), OSINT_DOMAIN_TIMEOUT),
+        'concurrency_limit': osint_concurrency_limit,
+        'shodan_api_key': os.getenv('SHODAN_API_KEY'),
+        'cache': osint_cache,
+        'force_refresh': bool(data.get('refresh', False)),
+        'single_flight': osint_single_flight,
+        'profile': data.get('profile', 'full'),
+        'port_profile': data.get('port_profile', 'common')
+    }
+
+def requested_domains(data, max_domains):
+    """(domains, None) from a request body's "domains" list or single "domain", or (None, 400 response)"""
+    domains = data.get('domains') if 'domains' in data else ([data['domain']] if data.get('domain') else [])
+    if not domains:
+        return None, (jsonify({'error': 'No domains provided'}), 400)
+    if not isinstance(domains, list) or not all(isinstance(domain, str) and domain.strip() for domain in domains):
+        return None, (jsonify({'error': 'domains must be a list of non-empty strings'}), 400)
+    if len(domains) > max_domains:
+        return None, (jsonify({'error': f'Too many domains: {len(domains)} (at most {max_domains} per request)'}), 400)
+    return domains, None
+
+def osint_result_status(osint_data):
+    """Per-domain outcome of a bulk OSINT collection"""
+    if osint_data.get('timed_out'):
+        return 'timeout'
+    return 'error' if 'error' in osint_data else 'ok'
+
 # Enhanced Database Models
 class EmployeeContact(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(50), nullable=False)
 
 class SecurityPosture(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False, index=True)
     network_security = db.Column(db.JSON)
     endpoint_security = db.Column(db.JSON)
     iam = db.Column(db.JSON)
@@ -51,8 +198,22 @@ class SecurityPosture(db.Model):
     email_security = db.Column(db.JSON)
     backup_recovery = db.Column(db.JSON)
     gaps_or_remarks = db.Column(db.Text)
+    
+    # Relationships
+    gap_tags = db.relationship('SecurityGapTag', backref='security_posture', lazy=True, cascade='all, delete-orphan')
+
+class SecurityGapTag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    security_posture_id = db.Column(db.Integer, db.ForeignKey('security_posture.id'), nullable=False, index=True)
+    category = db.Column(db.String(50), nullable=False, index=True)  # A SECURITY_GAP_CATEGORIES key
 
 class RiskAssessment(db.Model):
+    __table_args__ = (
+        # Latest assessment per client: partition by client, newest first
+        db.Index('ix_risk_assessment_client_latest', 'client_id',
+                 db.desc(db.column('assessment_date')), db.desc(db.column('id'))),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
     overall_risk_score = db.Column(db.Float, nullable=False)
@@ -68,7 +229,7 @@ class RiskAssessment(db.Model):
 
 class DataBreach(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False, index=True)
     breach_date = db.Column(db.Date)
     breach_type = db.Column(db.String(100))
     records_affected = db.Column(db.Integer)
@@ -78,7 +239,7 @@ class DataBreach(db.Model):
 
 class ThreatIntel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False, index=True)
     threat_type = db.Column(db.String(100))
     severity = db.Column(db.String(20))
     description = db.Column(db.Text)
@@ -86,6 +247,15 @@ class ThreatIntel(db.Model):
     status = db.Column(db.String(50))  # Active, Resolved, False Positive
 
 class Vendor(db.Model):
+    __table_args__ = (
+        # Vendor list: optional risk_level or industry filter, newest first
+        db.Index('ix_vendor_created_at', 'created_at', 'id'),
+        db.Index('ix_vendor_risk_level_created_at', 'risk_level', 'created_at', 'id'),
+        db.Index('ix_vendor_industry_created_at', 'industry', 'created_at', 'id'),
+        # Bulk import: rows are matched to existing vendors by name
+        db.Index('ix_vendor_company_name', 'company_name'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     company_name = db.Column(db.String(200), nullable=False)
     contact_name = db.Column(db.String(100), nullable=False)
@@ -104,8 +274,38 @@ class Vendor(db.Model):
     risk_score = db.Column(db.Float, default=0.0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    ai_report = db.relationship('VendorAIReport', backref='vendor', lazy=True, uselist=False, cascade='all, delete-orphan')
+
+class VendorAIReport(db.Model):
+    __table_args__ = (
+        # Report list: optional industry filter, riskiest first
+        db.Index('ix_vendor_ai_report_risk_score', 'risk_score', 'vendor_id'),
+        db.Index('ix_vendor_ai_report_industry_risk_score', 'industry', 'risk_score', 'vendor_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    vendor_id = db.Column(db.Integer, db.ForeignKey('vendor.id'), nullable=False, unique=True)
+    vendor_name = db.Column(db.String(200), nullable=False)
+    industry = db.Column(db.String(100))
+    employee_count = db.Column(db.String(50))
+    summary = db.Column(db.Text, nullable=False)
+    recommendations = db.Column(db.JSON)
+    risk_factors = db.Column(db.JSON)
+    risk_score = db.Column(db.Float, nullable=False)
+    source_hash = db.Column(db.String(64), nullable=False)  # Digest of the vendor fields the report is built from
+    report_date = db.Column(db.DateTime, default=datetime.utcnow)
 
 class SecurityAlert(db.Model):
+    __table_args__ = (
+        # Alert list: status (Active by default) with optional severity or vendor, newest first
+        db.Index('ix_security_alert_created_at', 'created_at', 'id'),
+        db.Index('ix_security_alert_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_security_alert_severity_status_created_at', 'severity', 'status', 'created_at', 'id'),
+        db.Index('ix_security_alert_vendor_status_created_at', 'vendor_id', 'status', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     vendor_id = db.Column(db.Integer, db.ForeignKey('vendor.id'), nullable=False)
     alert_type = db.Column(db.String(100), nullable=False)  # OSINT, Compliance, Threat, etc.
@@ -121,6 +321,13 @@ class SecurityAlert(db.Model):
     vendor = db.relationship('Vendor', backref='alerts')
 
 class MonitoringEvent(db.Model):
+    __table_args__ = (
+        # Event list: optional vendor or event type filter, newest first
+        db.Index('ix_monitoring_event_created_at', 'created_at', 'id'),
+        db.Index('ix_monitoring_event_vendor_created_at', 'vendor_id', 'created_at', 'id'),
+        db.Index('ix_monitoring_event_type_created_at', 'event_type', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     vendor_id = db.Column(db.Integer, db.ForeignKey('vendor.id'), nullable=False)
     event_type = db.Column(db.String(100), nullable=False)  # SSL_Expiry, Domain_Change, etc.
@@ -151,240 +358,334 @@ class Client(db.Model):
     # Relationships
     employee_contacts = db.relationship('EmployeeContact', backref='client', lazy=True, cascade='all, delete-orphan')
     security_posture = db.relationship('SecurityPosture', backref='client', lazy=True, uselist=False, cascade='all, delete-orphan')
-    risk_assessments = db.relationship('RiskAssessment', backref='client', lazy=True, cascade='all, delete-orphan')
+    risk_assessments = db.relationship('RiskAssessment', backref='client', lazy=True, cascade='all, delete-orphan',
+                                       order_by='(RiskAssessment.assessment_date, RiskAssessment.id)')
     data_breaches = db.relationship('DataBreach', backref='client', lazy=True, cascade='all, delete-orphan')
     threat_intel = db.relationship('ThreatIntel', backref='client', lazy=True, cascade='all, delete-orphan')
 
-# Risk Scoring Algorithm
-class RiskCalculator:
-    @staticmethod
-    def calculate_network_risk(security_tools, gaps):
-        base_score = 50
-        tool_bonus = len(security_tools) * 5
-        gap_penalty = len(gaps.split(',')) * 10 if gaps else 0
-        return max(0, min(100, base_score - tool_bonus + gap_penalty))
+class OSINTJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = db.Column(db.String(20), nullable=False, default='Queued')  # Queued, Running, Completed, Failed
+    domains = db.Column(db.JSON, nullable=False)  # Array of domains in submission order
+    options = db.Column(db.JSON)  # Bulk collection options (refresh, max_workers, domain_timeout)
+    total_domains = db.Column(db.Integer, nullable=False, default=0)
+    completed_domains = db.Column(db.Integer, nullable=False, default=0)
+    failed_domains = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # Last progress from the worker running the job
+    finished_at = db.Column(db.DateTime)
     
-    @staticmethod
-    def calculate_compliance_risk(standards, last_audit):
-        base_score = 30
-        if not standards:
-            return 80
-        if last_audit:
-            days_since_audit = (datetime.now().date() - last_audit).days
-            if days_since_audit > 365:
-                base_score += 20
-        return max(0, min(100, base_score))
+    # Relationships
+    results = db.relationship('OSINTJobResult', backref='job', lazy=True, cascade='all, delete-orphan')
+
+class OSINTJobResult(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('osint_job.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)  # Index of the domain in OSINTJob.domains
+    domain = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # ok, error, timeout
+    osint_data = db.Column(db.JSON)
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Gap categories and how to recognize them in SecurityPosture.gaps_or_remarks
+SECURITY_GAP_CATEGORIES = {
+    'DLP': lambda gaps: 'DLP' in gaps,
+    'MFA': lambda gaps: 'MFA' in gaps,
+    'Security Monitoring': lambda gaps: 'monitoring' in gaps.lower()
+}
+
+def security_gap_categories(gaps):
+    """Gap categories mentioned in a gaps_or_remarks text"""
+    if not gaps:
+        return []
+    return [category for category, matches in SECURITY_GAP_CATEGORIES.items() if matches(gaps)]
+
+@db.event.listens_for(db.session, 'before_flush')
+def tag_security_gaps(session, flush_context, instances):
+    """Keep SecurityGapTag rows in step with gaps_or_remarks whenever a posture is written"""
+    for posture in (*session.new, *session.dirty):
+        if not isinstance(posture, SecurityPosture):
+            continue
+        if posture in session.dirty and not db.inspect(posture).attrs.gaps_or_remarks.history.has_changes():
+            continue
+        posture.gap_tags = [SecurityGapTag(category=category)
+                            for category in security_gap_categories(posture.gaps_or_remarks)]
+
+def backfill_security_gap_tags(batch_size=1000):
+    """Tag postures written before SecurityGapTag existed; returns the number of postures tagged"""
+    tagged = 0
+    last_id = 0
+    while True:
+        postures = db.session.execute(
+            db.select(SecurityPosture)
+            .where(SecurityPosture.id > last_id,
+                   SecurityPosture.gaps_or_remarks.isnot(None),
+                   ~SecurityPosture.gap_tags.any())
+            .order_by(SecurityPosture.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not postures:
+            return tagged
+        
+        for posture in postures:
+            categories = security_gap_categories(posture.gaps_or_remarks)
+            db.session.add_all(SecurityGapTag(security_posture_id=posture.id, category=category)
+                               for category in categories)
+            tagged += bool(categories)
+        last_id = postures[-1].id
+        db.session.commit()
+
+# Vendor fields an AI report is built from; changing any of them regenerates the report
+AI_REPORT_FIELDS = ('company_name', 'industry', 'employee_count', 'data_processed', 'compliance_frameworks', 'osint_data')
+
+def ai_report_inputs(vendor):
+    """The values of a vendor that its AI report depends on, read the way build_ai_report reads them"""
+    osint_scores = (vendor.osint_data or {}).get('scores')
+    return {
+        'company_name': vendor.company_name,
+        'industry': vendor.industry,
+        'employee_count': vendor.employee_count,
+        'data_processed': vendor.data_processed,
+        'compliance_frameworks': vendor.compliance_frameworks,
+        # Any scores at all average the OSINT score in, with 75 standing in for a missing overall_score
+        'osint_overall_score': osint_scores.get('overall_score', 75) if osint_scores else None
+    }
+
+def ai_report_hash(vendor):
+    return hashlib.sha256(json.dumps(ai_report_inputs(vendor), sort_keys=True, default=str).encode()).hexdigest()
+
+def build_ai_report(vendor):
+    """Risk factors, recommendations, score and summary of a vendor's AI report"""
+    risk_factors = []
+    recommendations = []
     
-    @staticmethod
-    def calculate_breach_risk(breaches):
-        if not breaches or breaches == "None reported":
-            return 20
-        return 70
+    # Analyze industry risk
+    if vendor.industry in ['Financial Services', 'Healthcare']:
+        risk_factors.append('High regulatory compliance requirements')
+        recommendations.append('Ensure compliance with industry-specific regulations')
     
-    @staticmethod
-    def calculate_overall_risk(scores):
-        weights = {
-            'network_risk_score': 0.25,
-            'endpoint_risk_score': 0.20,
-            'cloud_risk_score': 0.15,
-            'compliance_risk_score': 0.20,
-            'data_breach_risk_score': 0.20
-        }
-        total_score = sum(scores[key] * weights[key] for key in weights)
-        return round(total_score, 2)
+    # Analyze employee count risk
+    if vendor.employee_count in ['1-10', '11-50']:
+        risk_factors.append('Small company with limited security resources')
+        recommendations.append('Consider additional security controls and monitoring')
     
-    @staticmethod
-    def get_risk_level(score):
-        if score < 30:
-            return "Low"
-        elif score < 60:
-            return "Medium"
-        elif score < 80:
-            return "High"
-        else:
-            return "Critical"
-
-class AdvancedRiskCalculator:
-    """Advanced risk assessment with ML-like features and behavioral analysis"""
+    # Analyze data processing risk
+    if vendor.data_processed and 'Personal Information' in vendor.data_processed:
+        risk_factors.append('Processes sensitive personal data')
+        recommendations.append('Implement strong data protection measures')
     
-    @staticmethod
-    def calculate_behavioral_risk(vendor_data):
-        """Calculate behavioral risk based on vendor patterns"""
-        risk_factors = []
-        score = 50
-        
-        # Company size analysis
-        if vendor_data.get('employee_count') in ['1-10', '11-50']:
-            risk_factors.append('Small company with limited resources')
-            score += 15
-        
-        # Industry risk analysis
-        high_risk_industries = ['Financial Services', 'Healthcare', 'Technology']
-        if vendor_data.get('industry') in high_risk_industries:
-            risk_factors.append('High-value target industry')
-            score += 10
-        
-        # Data sensitivity analysis
-        sensitive_data_types = ['Personal Information', 'Financial Data', 'Health Records']
-        if vendor_data.get('data_processed'):
-            sensitive_count = sum(1 for data_type in vendor_data['data_processed'] 
-                                if data_type in sensitive_data_types)
-            if sensitive_count > 0:
-                risk_factors.append(f'Processes {sensitive_count} types of sensitive data')
-                score += sensitive_count * 8
-        
-        # Compliance maturity
-        if not vendor_data.get('compliance_frameworks') or 'None' in vendor_data.get('compliance_frameworks', []):
-            risk_factors.append('No formal compliance frameworks')
-            score += 20
-        
-        # Geographic risk (simulated)
-        if vendor_data.get('country') in ['Russia', 'China', 'North Korea']:
-            risk_factors.append('High-risk geographic location')
-            score += 25
-        
-        return {
-            'score': min(100, max(0, score)),
-            'risk_factors': risk_factors,
-            'risk_level': RiskCalculator.get_risk_level(score)
-        }
+    # Analyze compliance gaps
+    if not vendor.compliance_frameworks or 'None' in vendor.compliance_frameworks:
+        risk_factors.append('No formal compliance frameworks')
+        recommendations.append('Consider implementing ISO 27001 or SOC 2')
     
-    @staticmethod
-    def calculate_geopolitical_risk(vendor_data):
-        """Calculate geopolitical risk factors"""
-        risk_factors = []
-        score = 30
-        
-        # Country risk mapping (simplified)
-        country_risk_scores = {
-            'United States': 20,
-            'Canada': 25,
-            'United Kingdom': 30,
-            'Germany': 35,
-            'France': 35,
-            'Japan': 30,
-            'Australia': 25,
-            'India': 50,
-            'China': 70,
-            'Russia': 80,
-            'Brazil': 45,
-            'Mexico': 55
-        }
-        
-        country = vendor_data.get('country', 'Unknown')
-        if country in country_risk_scores:
-            score += country_risk_scores[country]
-            if country_risk_scores[country] > 60:
-                risk_factors.append(f'High-risk country: {country}')
-        
-        # Regional instability factors
-        unstable_regions = ['Middle East', 'Eastern Europe', 'Southeast Asia']
-        if vendor_data.get('region') in unstable_regions:
-            risk_factors.append('Region with geopolitical instability')
-            score += 15
-        
-        return {
-            'score': min(100, max(0, score)),
-            'risk_factors': risk_factors,
-            'risk_level': RiskCalculator.get_risk_level(score)
-        }
+    # Calculate AI risk score
+    base_score = 50
+    if risk_factors:
+        base_score += len(risk_factors) * 10
+    if vendor.osint_data and vendor.osint_data.get('scores'):
+        osint_score = vendor.osint_data['scores'].get('overall_score', 75)
+        base_score = (base_score + osint_score) / 2
     
-    @staticmethod
-    def calculate_supply_chain_risk(vendor_data, vendor_history=None):
-        """Calculate supply chain dependency risk"""
-        risk_factors = []
-        score = 40
-        
-        # Dependency analysis
-        if vendor_data.get('industry') in ['Manufacturing', 'Technology']:
-            risk_factors.append('Critical supply chain dependency')
-            score += 20
-        
-        # Single source risk
-        if vendor_history and len(vendor_history) < 2:
-            risk_factors.append('Limited vendor alternatives')
-            score += 15
-        
-        # Financial stability indicators
-        if vendor_data.get('annual_revenue') in ['$1M-$10M', 'Less than $1M']:
-            risk_factors.append('Small company financial risk')
-            score += 10
-        
-        return {
-            'score': min(100, max(0, score)),
-            'risk_factors': risk_factors,
-            'risk_level': RiskCalculator.get_risk_level(score)
-        }
+    ai_score = min(100, max(0, base_score))
     
-    @staticmethod
-    def calculate_ml_enhanced_risk(vendor_data, osint_data=None):
-        """ML-enhanced risk calculation using multiple factors"""
-        features = []
-        
-        # Feature engineering
-        features.append(1 if vendor_data.get('employee_count') in ['1-10', '11-50'] else 0)  # Small company
-        features.append(1 if vendor_data.get('industry') in ['Financial Services', 'Healthcare'] else 0)  # High-value
-        features.append(len(vendor_data.get('data_processed', [])))  # Data types count
-        features.append(1 if not vendor_data.get('compliance_frameworks') else 0)  # No compliance
-        features.append(1 if osint_data and osint_data.get('dark_web_exposure', {}).get('exposed', False) else 0)  # Dark web
-        
-        # Simple ML-like scoring (in real implementation, use actual ML model)
-        weights = [0.25, 0.20, 0.15, 0.25, 0.15]
-        ml_score = sum(f * w for f, w in zip(features, weights)) * 100
-        
-        # Add noise for realistic variation
-        import random
-        ml_score += random.uniform(-5, 5)
-        
-        return {
-            'score': min(100, max(0, ml_score)),
-            'features': features,
-            'confidence': random.uniform(0.7, 0.95),
-            'risk_level': RiskCalculator.get_risk_level(ml_score)
-        }
+    # Generate AI summary
+    if ai_score < 30:
+        summary = f"{vendor.company_name} demonstrates excellent security posture with minimal risk factors identified."
+    elif ai_score < 60:
+        summary = f"{vendor.company_name} shows moderate security posture with some areas for improvement."
+    elif ai_score < 80:
+        summary = f"{vendor.company_name} has several security concerns that require immediate attention."
+    else:
+        summary = f"{vendor.company_name} presents significant security risks requiring urgent remediation."
     
-    @staticmethod
-    def generate_risk_recommendations(risk_analysis):
-        """Generate AI-powered risk recommendations"""
-        recommendations = []
-        
-        if risk_analysis.get('behavioral_risk', {}).get('score', 0) > 60:
-            recommendations.append({
-                'category': 'Behavioral Risk',
-                'priority': 'High',
-                'recommendation': 'Implement additional monitoring and controls for this vendor',
-                'action_items': [
-                    'Conduct quarterly security assessments',
-                    'Implement real-time monitoring',
-                    'Require additional security certifications'
-                ]
-            })
-        
-        if risk_analysis.get('geopolitical_risk', {}).get('score', 0) > 70:
-            recommendations.append({
-                'category': 'Geopolitical Risk',
-                'priority': 'Critical',
-                'recommendation': 'Consider vendor diversification due to geopolitical risks',
-                'action_items': [
-                    'Identify alternative vendors in lower-risk regions',
-                    'Implement enhanced due diligence',
-                    'Monitor geopolitical developments'
-                ]
-            })
-        
-        if risk_analysis.get('supply_chain_risk', {}).get('score', 0) > 50:
-            recommendations.append({
-                'category': 'Supply Chain Risk',
-                'priority': 'Medium',
-                'recommendation': 'Develop contingency plans for supply chain disruption',
-                'action_items': [
-                    'Identify backup vendors',
-                    'Increase inventory levels',
-                    'Diversify supply chain sources'
-                ]
-            })
-        
-        return recommendations
+    return {
+        'summary': summary,
+        'recommendations': recommendations[:3],  # Top 3 recommendations
+        'risk_score': round(ai_score, 1),
+        'risk_factors': risk_factors
+    }
+
+def refresh_ai_report(vendor):
+    """Regenerate a vendor's stored AI report if its inputs changed; returns whether it did"""
+    source_hash = ai_report_hash(vendor)
+    report = vendor.ai_report
+    if report is not None and report.source_hash == source_hash:
+        return False
+    if report is None:
+        report = vendor.ai_report = VendorAIReport()
+    for key, value in build_ai_report(vendor).items():
+        setattr(report, key, value)
+    report.vendor_name = vendor.company_name
+    report.industry = vendor.industry
+    report.employee_count = vendor.employee_count
+    report.source_hash = source_hash
+    report.report_date = datetime.utcnow()
+    return True
+
+@db.event.listens_for(db.session, 'before_flush')
+def maintain_ai_reports(session, flush_context, instances):
+    """Regenerate the AI report of every vendor written with changed report inputs"""
+    for vendor in (*session.new, *session.dirty):
+        if not isinstance(vendor, Vendor) or vendor in session.deleted:
+            continue
+        if vendor in session.dirty:
+            state = db.inspect(vendor)
+            if not any(state.attrs[field].history.has_changes() for field in AI_REPORT_FIELDS):
+                continue
+        refresh_ai_report(vendor)
+
+def sync_ai_reports(vendor_ids=None, missing_only=False, batch_size=500):
+    """
+    Bring stored AI reports up to date with their vendors
+    
+    Covers vendors written before reports were stored and rows changed by
+    bulk SQL, which bypasses the flush hook. Vendors whose inputs are
+    unchanged are skipped; missing_only only visits vendors without a
+    report. Returns the number of reports regenerated.
+    """
+    regenerated = 0
+    last_id = 0
+    while True:
+        query = (db.select(Vendor)
+                 .options(selectinload(Vendor.ai_report))
+                 .where(Vendor.id > last_id)
+                 .order_by(Vendor.id)
+                 .limit(batch_size))
+        if vendor_ids is not None:
+            query = query.where(Vendor.id.in_(vendor_ids))
+        if missing_only:
+            query = query.where(~Vendor.ai_report.has())
+        vendors = db.session.execute(query).scalars().all()
+        if not vendors:
+            return regenerated
+        regenerated += sum(refresh_ai_report(vendor) for vendor in vendors)
+        last_id = vendors[-1].id
+        db.session.commit()
+
+# Models the cached dashboard aggregates are computed from
+STATS_MODELS = (Client, RiskAssessment, DataBreach, ThreatIntel, SecurityPosture, SecurityGapTag)
+
+@db.event.listens_for(db.session, 'after_flush')
+def mark_stats_changes(session, flush_context):
+    """Remember whether this transaction touched data behind the cached aggregates"""
+    if any(isinstance(obj, STATS_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['stats_changed'] = True
+
+@db.event.listens_for(db.session, 'after_commit')
+def invalidate_stats_cache(session):
+    """Drop cached aggregates once a transaction that changed their data commits"""
+    if session.info.pop('stats_changed', False):
+        stats_cache.invalidate()
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_stats_changes(session):
+    session.info.pop('stats_changed', None)
+
+def latest_risk_assessment():
+    """Alias of RiskAssessment limited to each client's newest assessment, and its join condition
+
+    Ranks assessments per client with a window function so the latest one can
+    be outer-joined to Client in the same query instead of loading every
+    historical assessment per client.
+    """
+    ranked = db.select(
+        RiskAssessment,
+        db.func.row_number().over(
+            partition_by=RiskAssessment.client_id,
+            order_by=(RiskAssessment.assessment_date.desc(), RiskAssessment.id.desc())
+        ).label('rank')
+    ).subquery()
+    latest = aliased(RiskAssessment, ranked)
+    return latest, db.and_(latest.client_id == Client.id, ranked.c.rank == 1)
+
+def contact_counts():
+    """Subquery of employee contact counts per client_id"""
+    return db.select(
+        EmployeeContact.client_id,
+        db.func.count(EmployeeContact.id).label('contact_count')
+    ).group_by(EmployeeContact.client_id).subquery()
+
+# List endpoint queries, shared with check_query_plans.py so the checked plans are the served ones
+def vendor_list_query(risk_level=None, industry=None):
+    """Vendors for GET /api/vendors, newest first"""
+    query = Vendor.query
+    if risk_level:
+        query = query.filter(Vendor.risk_level == risk_level)
+    if industry:
+        query = query.filter(Vendor.industry == industry)
+    return query.order_by(Vendor.created_at.desc(), Vendor.id.desc())
+
+def alert_list_query(severity=None, status=None, vendor_id=None):
+    """Security alerts for GET /api/alerts, newest first"""
+    query = SecurityAlert.query
+    if severity:
+        query = query.filter(SecurityAlert.severity == severity)
+    if status:
+        query = query.filter(SecurityAlert.status == status)
+    if vendor_id:
+        query = query.filter(SecurityAlert.vendor_id == vendor_id)
+    return query.order_by(SecurityAlert.created_at.desc(), SecurityAlert.id.desc())
+
+def monitoring_event_list_query(vendor_id=None, event_type=None):
+    """Monitoring events for GET /api/monitoring/events, newest first"""
+    query = MonitoringEvent.query
+    if vendor_id:
+        query = query.filter(MonitoringEvent.vendor_id == vendor_id)
+    if event_type:
+        query = query.filter(MonitoringEvent.event_type == event_type)
+    return query.order_by(MonitoringEvent.created_at.desc(), MonitoringEvent.id.desc())
+
+def list_page(query, model, per_page):
+    """A page of a list query: keyset when ?cursor= or ?pagination=cursor is given, else ?page= offset"""
+    if 'cursor' in request.args or request.args.get('pagination') == 'cursor':
+        return keyset_paginate(query, model, request.args.get('cursor') or None, per_page)
+    return query.paginate(page=request.args.get('page', 1, type=int), per_page=per_page, error_out=False)
+
+def pagination_info(page, query):
+    """Pagination block of a list response; ?total=approximate adds a cheap total in cursor mode"""
+    if isinstance(page, KeysetPage):
+        info = page.to_dict()
+        if request.args.get('total') == 'approximate':
+            info['approximate_total'] = approximate_count(query)
+        return info
+    return {
+        'page': page.page,
+        'pages': page.pages,
+        'per_page': page.per_page,
+        'total': page.total
+    }
+
+def create_missing_indexes():
+    """Create model indexes absent from existing tables; create_all() only indexes new tables"""
+    created = []
+    inspector = db.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                created.append(index.name)
+    return created
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing tables and model indexes and bring derived rows up to date; run on every deploy"""
+    db.create_all()
+    created = create_missing_indexes()
+    print(f"Created indexes: {', '.join(created)}" if created else "All indexes present")
+    print(f"Tagged security gaps of {backfill_security_gap_tags()} postures")
+    print(f"Regenerated {sync_ai_reports()} AI reports")
+
+@app.cli.command('sync-ai-reports')
+def sync_ai_reports_command():
+    """Regenerate stored AI reports whose vendor inputs changed, e.g. after bulk SQL updates"""
+    print(f"Regenerated {sync_ai_reports()} AI reports")
 
 # Mock Data Generator
 class MockDataGenerator:
@@ -728,6 +1029,132 @@ class MockDataGenerator:
         
         return count
 
+class OSINTJobRunner:
+    """Runs queued OSINT jobs in a background thread, off the request path
+    
+    Jobs and their per-domain results live in the database, so any worker can
+    pick up queued jobs. Once a restarted worker starts its runner (see
+    start_osint_job_runner), it resumes queued jobs, and jobs whose worker
+    stopped reporting progress, where they stopped.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+    
+    def start(self):
+        """Start the runner thread once per process"""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run_forever, name='osint-job-runner', daemon=True)
+            self._thread.start()
+    
+    def notify(self):
+        """Wake the runner up to look for new jobs"""
+        self._wakeup.set()
+    
+    def _run_forever(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    job_id = self._claim_next_job()
+                    if job_id:
+                        self._process_job(job_id)
+                        continue
+            except Exception:
+                logger.exception("OSINT job runner error")
+            
+            self._wakeup.wait(OSINT_JOB_POLL_INTERVAL)
+            self._wakeup.clear()
+    
+    def _claim_next_job(self):
+        """Atomically move the oldest queued job to Running; returns its id or None"""
+        now = datetime.utcnow()
+        
+        # Requeue jobs whose worker stopped reporting progress (e.g. it was restarted)
+        db.session.execute(
+            db.update(OSINTJob)
+            .where(OSINTJob.status == 'Running',
+                   OSINTJob.heartbeat_at < now - timedelta(seconds=OSINT_JOB_STALE_SECONDS))
+            .values(status='Queued')
+        )
+        db.session.commit()
+        
+        candidates = db.session.execute(
+            db.select(OSINTJob.id)
+            .where(OSINTJob.status == 'Queued')
+            .order_by(OSINTJob.created_at)
+            .limit(5)
+        ).scalars().all()
+        
+        for job_id in candidates:
+            claimed = db.session.execute(
+                db.update(OSINTJob)
+                .where(OSINTJob.id == job_id, OSINTJob.status == 'Queued')
+                .values(status='Running', started_at=now, heartbeat_at=now)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return job_id
+        return None
+    
+    def _process_job(self, job_id):
+        job = db.session.get(OSINTJob, job_id)
+        try:
+            # Skip domains finished before a restart
+            done_positions = set(db.session.execute(
+                db.select(OSINTJobResult.position).where(OSINTJobResult.job_id == job_id)
+            ).scalars())
+            remaining = [(position, domain) for position, domain in enumerate(job.domains)
+                         if position not in done_positions]
+            
+            collected = iter_bulk_vendor_osint([domain for _, domain in remaining],
+                                               **bulk_osint_options(job.options or {}))
+            for index, domain, osint_data in collected:
+                status = osint_result_status(osint_data)
+                db.session.add(OSINTJobResult(
+                    job_id=job_id,
+                    position=remaining[index][0],
+                    domain=domain,
+                    status=status,
+                    osint_data=osint_data
+                ))
+                job.completed_domains += 1
+                if status != 'ok':
+                    job.failed_domains += 1
+                job.heartbeat_at = datetime.utcnow()
+                db.session.commit()
+            
+            job.status = 'Completed'
+        except Exception as e:
+            db.session.rollback()
+            job.status = 'Failed'
+            job.error = str(e)
+        
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+osint_job_runner = OSINTJobRunner(app)
+
+def start_osint_job_runner():
+    """Start this process's OSINT job runner unless OSINT_JOB_RUNNER_ENABLED is off
+    
+    Workers call it as they boot (gunicorn.conf.py, or the dev server below),
+    so jobs left over from a restart resume without waiting for a request.
+    """
+    if OSINT_JOB_RUNNER_ENABLED:
+        osint_job_runner.start()
+
+@app.before_request
+def ensure_osint_job_runner():
+    """Fallback for servers that do not start the runner at boot"""
+    start_osint_job_runner()
+
 # Marshmallow Schemas
 class EmployeeContactSchema(Schema):
     name = fields.Str(required=True, validate=lambda x: len(x) <= 100)
@@ -746,18 +1173,18 @@ class SecurityPostureSchema(Schema):
     gaps_or_remarks = fields.Str()
 
 class VendorSchema(Schema):
-    company_name = fields.Str(required=True, validate=lambda x: len(x) <= 200)
-    contact_name = fields.Str(required=True, validate=lambda x: len(x) <= 100)
+    company_name = fields.Str(required=True, validate=validate.Length(max=200))
+    contact_name = fields.Str(required=True, validate=validate.Length(max=100))
     contact_email = fields.Email(required=True)
-    contact_phone = fields.Str(validate=lambda x: len(x) <= 20)
-    website = fields.Str(validate=lambda x: len(x) <= 200)
-    industry = fields.Str(required=True, validate=lambda x: len(x) <= 100)
-    employee_count = fields.Str(required=True, validate=lambda x: len(x) <= 50)
-    annual_revenue = fields.Str(validate=lambda x: len(x) <= 50)
+    contact_phone = fields.Str(validate=validate.Length(max=20))
+    website = fields.Str(validate=validate.Length(max=200))
+    industry = fields.Str(required=True, validate=validate.Length(max=100))
+    employee_count = fields.Str(required=True, validate=validate.Length(max=50))
+    annual_revenue = fields.Str(validate=validate.Length(max=50))
     data_processed = fields.List(fields.Str())
     compliance_frameworks = fields.List(fields.Str())
     security_certifications = fields.List(fields.Str())
-    risk_level = fields.Str(validate=lambda x: x in ['Low', 'Medium', 'High', 'Critical'])
+    risk_level = fields.Str(validate=validate.OneOf(['Low', 'Medium', 'High', 'Critical']))
     description = fields.Str()
 
 class ClientSchema(Schema):
@@ -776,6 +1203,13 @@ class ClientSchema(Schema):
     employee_count = fields.Int()
     annual_revenue = fields.Str()
 
+# VendorSchema fields that CSV imports hold as ";"-separated lists
+VENDOR_LIST_FIELDS = ('data_processed', 'compliance_frameworks', 'security_certifications')
+
+def vendor_import_validator():
+    """Row validator of vendor imports; its fast-path rules are read off VendorSchema"""
+    return FastRowValidator(VendorSchema())
+
 # Initialize schemas
 client_schema = ClientSchema()
 employee_contact_schema = EmployeeContactSchema()
@@ -866,12 +1300,18 @@ def create_client():
 def get_clients():
     """Get all clients with basic information and risk scores"""
     try:
-        clients = Client.query.all()
+        # One query: each client with its latest assessment and contact count
+        latest, latest_join = latest_risk_assessment()
+        counts = contact_counts()
+        rows = db.session.execute(
+            db.select(Client, latest, counts.c.contact_count)
+            .outerjoin(latest, latest_join)
+            .outerjoin(counts, counts.c.client_id == Client.id)
+            .order_by(Client.id)
+        ).all()
         client_list = []
         
-        for client in clients:
-            latest_risk = client.risk_assessments[-1] if client.risk_assessments else None
-            
+        for client, latest_risk, contact_count in rows:
             client_data = {
                 'id': client.id,
                 'company_name': client.company_name,
@@ -881,7 +1321,7 @@ def get_clients():
                 'employee_count': client.employee_count,
                 'annual_revenue': client.annual_revenue,
                 'created_at': client.created_at.isoformat() if client.created_at else None,
-                'employee_count_contacts': len(client.employee_contacts),
+                'employee_count_contacts': contact_count or 0,
                 'risk_score': latest_risk.overall_risk_score if latest_risk else None,
                 'risk_level': latest_risk.risk_level if latest_risk else None,
                 'last_assessment': latest_risk.assessment_date.isoformat() if latest_risk else None
@@ -900,8 +1340,22 @@ def get_clients():
 def get_client(client_id):
     """Get detailed information for a specific client"""
     try:
-        client = Client.query.get_or_404(client_id)
-        latest_risk = client.risk_assessments[-1] if client.risk_assessments else None
+        client = db.session.get(Client, client_id, options=[
+            selectinload(Client.employee_contacts),
+            joinedload(Client.security_posture),
+            selectinload(Client.data_breaches),
+            selectinload(Client.threat_intel)
+        ])
+        if not client:
+            return jsonify({'error': 'Client not found'}), 404
+        
+        # Only the newest assessment is needed, not the whole history
+        latest_risk = db.session.execute(
+            db.select(RiskAssessment)
+            .filter_by(client_id=client.id)
+            .order_by(RiskAssessment.assessment_date.desc(), RiskAssessment.id.desc())
+            .limit(1)
+        ).scalar()
         
         client_data = {
             'id': client.id,
@@ -979,103 +1433,99 @@ def get_client(client_id):
 def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        total_clients = Client.query.count()
-        clients = Client.query.all()
-        
-        risk_levels = {'Low': 0, 'Medium': 0, 'High': 0, 'Critical': 0}
-        sectors = {}
-        total_breaches = 0
-        total_threats = 0
-        
-        for client in clients:
-            if client.risk_assessments:
-                risk_level = client.risk_assessments[-1].risk_level
-                risk_levels[risk_level] += 1
-            
-            sector = client.sector
-            sectors[sector] = sectors.get(sector, 0) + 1
-            
-            total_breaches += len(client.data_breaches)
-            total_threats += len(client.threat_intel)
-        
-        avg_risk_score = sum(
-            client.risk_assessments[-1].overall_risk_score 
-            for client in clients 
-            if client.risk_assessments
-        ) / len([c for c in clients if c.risk_assessments]) if clients else 0
-        
-        return jsonify({
-            'total_clients': total_clients,
-            'average_risk_score': round(avg_risk_score, 2),
-            'risk_distribution': risk_levels,
-            'sector_distribution': sectors,
-            'total_data_breaches': total_breaches,
-            'active_threats': total_threats,
-            'high_risk_clients': risk_levels['High'] + risk_levels['Critical']
-        }), 200
+        return jsonify(stats_cache.get_or_compute('dashboard_stats', compute_dashboard_stats)), 200
         
     except Exception as e:
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+def compute_dashboard_stats():
+    """Dashboard statistics from grouped SQL aggregates over each client's latest assessment"""
+    latest, latest_join = latest_risk_assessment()
+    
+    total_clients = db.session.execute(db.select(db.func.count(Client.id))).scalar()
+    
+    risk_levels = {'Low': 0, 'Medium': 0, 'High': 0, 'Critical': 0}
+    level_rows = db.session.execute(
+        db.select(latest.risk_level, db.func.count())
+        .select_from(Client)
+        .join(latest, latest_join)
+        .group_by(latest.risk_level)
+    ).all()
+    for level, count in level_rows:
+        if level is not None:
+            risk_levels[level] = risk_levels.get(level, 0) + count
+    
+    avg_risk_score = db.session.execute(
+        db.select(db.func.avg(latest.overall_risk_score)).select_from(Client).join(latest, latest_join)
+    ).scalar()
+    
+    sectors = dict(db.session.execute(
+        db.select(Client.sector, db.func.count(Client.id)).group_by(Client.sector)
+    ).all())
+    
+    total_breaches = db.session.execute(db.select(db.func.count(DataBreach.id))).scalar()
+    total_threats = db.session.execute(db.select(db.func.count(ThreatIntel.id))).scalar()
+    
+    return {
+        'total_clients': total_clients,
+        'average_risk_score': round(float(avg_risk_score or 0), 2),
+        'risk_distribution': risk_levels,
+        'sector_distribution': sectors,
+        'total_data_breaches': total_breaches,
+        'active_threats': total_threats,
+        'high_risk_clients': risk_levels['High'] + risk_levels['Critical']
+    }
+
 @app.route('/api/risk-analysis', methods=['GET'])
 def get_risk_analysis():
     """Get comprehensive risk analysis across all clients"""
     try:
-        clients = Client.query.all()
-        analysis = {
-            'overall_risk_trends': [],
-            'sector_risk_comparison': {},
-            'top_risks': [],
-            'security_gaps': {},
-            'compliance_status': {}
-        }
-        
-        sector_risks = {}
-        all_gaps = []
-        
-        for client in clients:
-            if client.risk_assessments:
-                risk = client.risk_assessments[-1]
-                
-                # Sector risk analysis
-                if client.sector not in sector_risks:
-                    sector_risks[client.sector] = []
-                sector_risks[client.sector].append(risk.overall_risk_score)
-                
-                # Security gaps analysis
-                if client.security_posture and client.security_posture.gaps_or_remarks:
-                    all_gaps.append(client.security_posture.gaps_or_remarks)
-        
-        # Calculate sector averages
-        for sector, scores in sector_risks.items():
-            analysis['sector_risk_comparison'][sector] = round(sum(scores) / len(scores), 2)
-        
-        # Top risks
-        analysis['top_risks'] = [
-            "Insufficient DLP implementation",
-            "MFA not fully deployed",
-            "Outdated security tools",
-            "Inadequate incident response procedures",
-            "Limited security awareness training"
-        ]
-        
-        # Security gaps summary
-        gap_counts = {}
-        for gap in all_gaps:
-            if 'DLP' in gap:
-                gap_counts['DLP'] = gap_counts.get('DLP', 0) + 1
-            if 'MFA' in gap:
-                gap_counts['MFA'] = gap_counts.get('MFA', 0) + 1
-            if 'monitoring' in gap.lower():
-                gap_counts['Security Monitoring'] = gap_counts.get('Security Monitoring', 0) + 1
-        
-        analysis['security_gaps'] = gap_counts
-        
-        return jsonify(analysis), 200
+        return jsonify(stats_cache.get_or_compute('risk_analysis', compute_risk_analysis)), 200
         
     except Exception as e:
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+def compute_risk_analysis():
+    """Risk analysis from grouped aggregates over assessed clients' latest assessments and gap tags"""
+    latest, latest_join = latest_risk_assessment()
+    analysis = {
+        'overall_risk_trends': [],
+        'sector_risk_comparison': {},
+        'top_risks': [],
+        'security_gaps': {},
+        'compliance_status': {}
+    }
+    
+    # Calculate sector averages
+    sector_rows = db.session.execute(
+        db.select(Client.sector, db.func.avg(latest.overall_risk_score))
+        .join(latest, latest_join)
+        .group_by(Client.sector)
+    ).all()
+    for sector, average in sector_rows:
+        analysis['sector_risk_comparison'][sector] = round(float(average), 2)
+    
+    # Top risks
+    analysis['top_risks'] = [
+        "Insufficient DLP implementation",
+        "MFA not fully deployed",
+        "Outdated security tools",
+        "Inadequate incident response procedures",
+        "Limited security awareness training"
+    ]
+    
+    # Security gaps summary, from the categories tagged when postures were written
+    gap_rows = db.session.execute(
+        db.select(SecurityGapTag.category, db.func.count(SecurityGapTag.id))
+        .join(SecurityPosture, SecurityGapTag.security_posture_id == SecurityPosture.id)
+        .join(Client, SecurityPosture.client_id == Client.id)
+        .join(latest, latest_join)
+        .group_by(SecurityGapTag.category)
+    ).all()
+    analysis['security_gaps'] = dict(gap_rows)
+    
+    return analysis
+
 @app.route('/api/mock-data', methods=['POST'])
 def generate_mock_data():
     """Generate mock data for testing"""
@@ -1169,25 +1619,197 @@ def create_vendor():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# Bulk vendor import: rows validated and written per batch, and what to do with rows naming an existing vendor
+VENDOR_IMPORT_BATCH_SIZE = int(os.getenv('VENDOR_IMPORT_BATCH_SIZE', 1000))
+VENDOR_IMPORT_CONFLICT_MODES = ('update', 'skip')
+# Most rejected rows listed in an import report; the rest are only counted
+VENDOR_IMPORT_MAX_ERRORS = int(os.getenv('VENDOR_IMPORT_MAX_ERRORS', 1000))
+
+def vendor_import_defaults():
+    """Column values of a new vendor for every field an import row may leave out"""
+    defaults = {field: None for field in VendorSchema().fields}
+    for column in Vendor.__table__.columns:
+        if column.default is not None and column.default.is_scalar:
+            defaults[column.name] = column.default.arg
+    return defaults
+
+def insert_vendor_rows(rows):
+    """Insert complete vendor rows, returning their IDs; PostgreSQL loads them with COPY"""
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return db.session.execute(db.insert(Vendor).returning(Vendor.id), rows).scalars().all()
+    
+    columns = list(rows[0])
+    column_list = ', '.join(columns)
+    db.session.execute(db.text(
+        f"CREATE TEMP TABLE vendor_import_staging ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {Vendor.__tablename__} WITH NO DATA"
+    ))
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY vendor_import_staging ({column_list}) FROM STDIN", copy_text_rows(rows, columns))
+    finally:
+        cursor.close()
+    vendor_ids = db.session.execute(db.text(
+        f"INSERT INTO {Vendor.__tablename__} ({column_list}) SELECT {column_list} FROM vendor_import_staging RETURNING id"
+    )).scalars().all()
+    db.session.execute(db.text("DROP TABLE vendor_import_staging"))
+    return vendor_ids
+
+def write_vendor_import_batch(rows, on_conflict):
+    """
+    Write validated import rows, matching them to existing vendors by company_name
+    
+    New names are inserted. Existing vendors get the row's fields when
+    on_conflict is 'update' (fields the row leaves out are kept) and are left
+    alone when it is 'skip'. Does not commit.
+    
+    Returns:
+        Tuple of (inserted vendor IDs, updated vendor IDs, number of skipped rows)
+    """
+    existing = {}
+    names = {row['company_name'] for row in rows}
+    for vendor_id, name in db.session.execute(
+            db.select(Vendor.id, Vendor.company_name).where(Vendor.company_name.in_(names))):
+        existing.setdefault(name, []).append(vendor_id)
+    
+    now = datetime.utcnow()
+    defaults = vendor_import_defaults()
+    new_rows = [{**defaults, **row, 'created_at': now, 'updated_at': now}
+                for row in rows if row['company_name'] not in existing]
+    inserted_ids = insert_vendor_rows(new_rows) if new_rows else []
+    
+    conflicting = [row for row in rows if row['company_name'] in existing]
+    if on_conflict == 'skip':
+        return inserted_ids, [], len(conflicting)
+    
+    updates = [{**row, 'id': vendor_id, 'updated_at': now}
+               for row in conflicting for vendor_id in existing[row['company_name']]]
+    if updates:
+        db.session.execute(db.update(Vendor), updates)
+    return inserted_ids, [update['id'] for update in updates], 0
+
+def reject_import_row(report, row_number, company_name, errors):
+    """Count a rejected import row, listing it while the report has room"""
+    report['rejected'] += 1
+    if len(report['errors']) < VENDOR_IMPORT_MAX_ERRORS:
+        report['errors'].append({'row': row_number, 'company_name': company_name, 'errors': errors})
+    else:
+        report['errors_omitted'] += 1
+
+def import_vendor_batch(batch, on_conflict, report):
+    """
+    Write and commit one batch of (row number, validated row), recording the outcome in report
+    
+    A batch the database rejects is retried row by row, so only the rows it
+    objects to are reported. The batch goes in through bulk statements,
+    which bypass the flush hooks, so AI reports are synced afterwards.
+    """
+    try:
+        results = [write_vendor_import_batch([row for _, row in batch], on_conflict)]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        results = []
+        for row_number, row in batch:
+            try:
+                results.append(write_vendor_import_batch([row], on_conflict))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                reject_import_row(report, row_number, row['company_name'], {'_row': [f'Database error: {e}']})
+    
+    vendor_ids = []
+    for inserted_ids, updated_ids, skipped in results:
+        report['inserted'] += len(inserted_ids)
+        report['updated'] += len(updated_ids)
+        report['skipped'] += skipped
+        vendor_ids += inserted_ids + updated_ids
+    if vendor_ids:
+        sync_ai_reports(vendor_ids=vendor_ids)
+
+def run_vendor_import(stream, fmt, on_conflict, report):
+    """
+    Validate and write an import body batch by batch, filling in report
+    
+    Rejected rows (unreadable, invalid, or naming a vendor already seen in
+    this import) are counted in report['rejected'] and the first
+    VENDOR_IMPORT_MAX_ERRORS of them listed in report['errors']; the rest
+    are imported.
+    Batches are committed as they go, so rows before a malformed body stay
+    imported.
+    """
+    validator = vendor_import_validator()
+    seen = {}
+    batch = []
+    
+    for row_number, record, errors in iter_import_rows(stream, fmt, VENDOR_LIST_FIELDS):
+        report['total_rows'] += 1
+        company_name = record.get('company_name') if record is not None else None
+        if record is not None:
+            record, errors = validator.validate(record)
+        if record is not None and record['company_name'] in seen:
+            errors = {'company_name': [f"Duplicate of row {seen[record['company_name']]} in this import"]}
+        if errors:
+            reject_import_row(report, row_number, company_name, errors)
+            continue
+        
+        seen[record['company_name']] = row_number
+        batch.append((row_number, record))
+        if len(batch) >= VENDOR_IMPORT_BATCH_SIZE:
+            import_vendor_batch(batch, on_conflict, report)
+            batch = []
+    
+    if batch:
+        import_vendor_batch(batch, on_conflict, report)
+
+@app.route('/api/vendors/import', methods=['POST'])
+def import_vendors():
+    """Create or update vendors in bulk from a CSV or NDJSON body
+    
+    The body is the file itself (Content-Type text/csv or
+    application/x-ndjson, or ?format=csv|ndjson) or a multipart upload in
+    the "file" field. Rows take VendorSchema's fields; CSV list columns
+    separate their values with ";". Rows are matched to existing vendors by
+    company_name: ?on_conflict=update (default) updates them, skip leaves
+    them. Invalid rows are reported per row and do not stop the import.
+    """
+    report = {'total_rows': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'rejected': 0,
+              'errors': [], 'errors_omitted': 0}
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            stream = upload.stream
+            fmt = import_format(upload.mimetype, request.args.get('format'), upload.filename)
+        else:
+            stream = request.stream
+            fmt = import_format(request.content_type, request.args.get('format'))
+        if fmt is None:
+            return jsonify({'error': 'Unsupported import format',
+                            'details': 'Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson'}), 400
+        
+        on_conflict = request.args.get('on_conflict', 'update')
+        if on_conflict not in VENDOR_IMPORT_CONFLICT_MODES:
+            return jsonify({'error': f'Unknown on_conflict mode: {on_conflict}',
+                            'available_modes': list(VENDOR_IMPORT_CONFLICT_MODES)}), 400
+        
+        run_vendor_import(stream, fmt, on_conflict, report)
+        
+        return jsonify({'message': 'Vendor import finished', 'format': fmt, 'on_conflict': on_conflict, **report})
+    except ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({'error': 'Invalid import file', 'details': str(e), **report}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error', 'details': str(e), **report}), 500
+
 @app.route('/api/vendors', methods=['GET'])
 def get_vendors():
     """Get all vendors with optional filtering"""
     try:
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        risk_level = request.args.get('risk_level')
-        industry = request.args.get('industry')
+        query = vendor_list_query(request.args.get('risk_level'), request.args.get('industry'))
         
-        query = Vendor.query
-        
-        if risk_level:
-            query = query.filter(Vendor.risk_level == risk_level)
-        if industry:
-            query = query.filter(Vendor.industry == industry)
-        
-        vendors = query.order_by(Vendor.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        vendors = list_page(query, Vendor, per_page)
         
         return jsonify({
             'vendors': [{
@@ -1202,13 +1824,10 @@ def get_vendors():
                 'risk_score': vendor.risk_score,
                 'created_at': vendor.created_at.isoformat()
             } for vendor in vendors.items],
-            'pagination': {
-                'page': vendors.page,
-                'pages': vendors.pages,
-                'per_page': vendors.per_page,
-                'total': vendors.total
-            }
+            'pagination': pagination_info(vendors, query)
         })
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1283,71 +1902,48 @@ def delete_vendor(vendor_id):
 
 @app.route('/api/ai-reports', methods=['GET'])
 def get_ai_reports():
-    """Get AI-generated reports for all vendors"""
+    """Get stored AI-generated vendor reports, paginated and filterable
+    
+    Filters: industry, min_score, max_score. Reports are ordered riskiest first.
+    """
     try:
-        vendors = Vendor.query.all()
-        reports = []
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        industry = request.args.get('industry')
+        min_score = request.args.get('min_score', type=float)
+        max_score = request.args.get('max_score', type=float)
         
-        for vendor in vendors:
-            # Generate AI analysis based on vendor data
-            risk_factors = []
-            recommendations = []
-            
-            # Analyze industry risk
-            if vendor.industry in ['Financial Services', 'Healthcare']:
-                risk_factors.append('High regulatory compliance requirements')
-                recommendations.append('Ensure compliance with industry-specific regulations')
-            
-            # Analyze employee count risk
-            if vendor.employee_count in ['1-10', '11-50']:
-                risk_factors.append('Small company with limited security resources')
-                recommendations.append('Consider additional security controls and monitoring')
-            
-            # Analyze data processing risk
-            if vendor.data_processed and 'Personal Information' in vendor.data_processed:
-                risk_factors.append('Processes sensitive personal data')
-                recommendations.append('Implement strong data protection measures')
-            
-            # Analyze compliance gaps
-            if not vendor.compliance_frameworks or 'None' in vendor.compliance_frameworks:
-                risk_factors.append('No formal compliance frameworks')
-                recommendations.append('Consider implementing ISO 27001 or SOC 2')
-            
-            # Calculate AI risk score
-            base_score = 50
-            if risk_factors:
-                base_score += len(risk_factors) * 10
-            if vendor.osint_data and vendor.osint_data.get('scores'):
-                osint_score = vendor.osint_data['scores'].get('overall_score', 75)
-                base_score = (base_score + osint_score) / 2
-            
-            ai_score = min(100, max(0, base_score))
-            
-            # Generate AI summary
-            if ai_score < 30:
-                summary = f"{vendor.company_name} demonstrates excellent security posture with minimal risk factors identified."
-            elif ai_score < 60:
-                summary = f"{vendor.company_name} shows moderate security posture with some areas for improvement."
-            elif ai_score < 80:
-                summary = f"{vendor.company_name} has several security concerns that require immediate attention."
-            else:
-                summary = f"{vendor.company_name} presents significant security risks requiring urgent remediation."
-            
-            reports.append({
-                'id': vendor.id,
-                'vendor_name': vendor.company_name,
-                'report_date': vendor.updated_at.isoformat(),
-                'summary': summary,
-                'recommendations': recommendations[:3],  # Top 3 recommendations
-                'risk_score': round(ai_score, 1),
-                'risk_factors': risk_factors,
-                'industry': vendor.industry,
-                'employee_count': vendor.employee_count
-            })
+        query = VendorAIReport.query
+        if industry:
+            query = query.filter(VendorAIReport.industry == industry)
+        if min_score is not None:
+            query = query.filter(VendorAIReport.risk_score >= min_score)
+        if max_score is not None:
+            query = query.filter(VendorAIReport.risk_score <= max_score)
+        
+        reports = query.order_by(VendorAIReport.risk_score.desc(), VendorAIReport.vendor_id.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
         
         return jsonify({
-            'reports': reports,
-            'total_reports': len(reports),
+            'reports': [{
+                'id': report.vendor_id,
+                'vendor_name': report.vendor_name,
+                'report_date': report.report_date.isoformat() if report.report_date else None,
+                'summary': report.summary,
+                'recommendations': report.recommendations,
+                'risk_score': report.risk_score,
+                'risk_factors': report.risk_factors,
+                'industry': report.industry,
+                'employee_count': report.employee_count
+            } for report in reports.items],
+            'total_reports': reports.total,
+            'pagination': {
+                'page': reports.page,
+                'pages': reports.pages,
+                'per_page': reports.per_page,
+                'total': reports.total
+            },
             'generated_at': datetime.utcnow().isoformat()
         })
     except Exception as e:
@@ -1452,25 +2048,15 @@ def get_vendor_ai_report(vendor_id):
 def get_alerts():
     """Get all security alerts with optional filtering"""
     try:
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        severity = request.args.get('severity')
-        status = request.args.get('status', 'Active')
-        vendor_id = request.args.get('vendor_id', type=int)
-        
-        query = SecurityAlert.query
-        
-        if severity:
-            query = query.filter(SecurityAlert.severity == severity)
-        if status:
-            query = query.filter(SecurityAlert.status == status)
-        if vendor_id:
-            query = query.filter(SecurityAlert.vendor_id == vendor_id)
-        
-        alerts = query.order_by(SecurityAlert.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        query = alert_list_query(
+            severity=request.args.get('severity'),
+            status=request.args.get('status', 'Active'),
+            vendor_id=request.args.get('vendor_id', type=int)
         )
         
+        alerts = list_page(query, SecurityAlert, per_page)
+        
         return jsonify({
             'alerts': [{
                 'id': alert.id,
@@ -1484,13 +2070,10 @@ def get_alerts():
                 'created_at': alert.created_at.isoformat(),
                 'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None
             } for alert in alerts.items],
-            'pagination': {
-                'page': alerts.page,
-                'pages': alerts.pages,
-                'per_page': alerts.per_page,
-                'total': alerts.total
-            }
+            'pagination': pagination_info(alerts, query)
         })
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1520,21 +2103,10 @@ def update_alert(alert_id):
 def get_monitoring_events():
     """Get monitoring events"""
     try:
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
-        vendor_id = request.args.get('vendor_id', type=int)
-        event_type = request.args.get('event_type')
-        
-        query = MonitoringEvent.query
-        
-        if vendor_id:
-            query = query.filter(MonitoringEvent.vendor_id == vendor_id)
-        if event_type:
-            query = query.filter(MonitoringEvent.event_type == event_type)
+        query = monitoring_event_list_query(request.args.get('vendor_id', type=int), request.args.get('event_type'))
         
-        events = query.order_by(MonitoringEvent.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        events = list_page(query, MonitoringEvent, per_page)
         
         return jsonify({
             'events': [{
@@ -1546,13 +2118,10 @@ def get_monitoring_events():
                 'severity': event.severity,
                 'created_at': event.created_at.isoformat()
             } for event in events.items],
-            'pagination': {
-                'page': events.page,
-                'pages': events.pages,
-                'per_page': events.per_page,
-                'total': events.total
-            }
+            'pagination': pagination_info(events, query)
         })
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1700,9 +2269,125 @@ def get_advanced_risk_assessment(vendor_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Bulk risk assessment: vendors loaded per IN query, and the batch size above which scoring moves to worker processes
+BULK_ASSESSMENT_CHUNK_SIZE = int(os.getenv('BULK_ASSESSMENT_CHUNK_SIZE', 1000))
+BULK_ASSESSMENT_PROCESS_THRESHOLD = int(os.getenv('BULK_ASSESSMENT_PROCESS_THRESHOLD', 5000))
+BULK_ASSESSMENT_WORKERS = int(os.getenv('BULK_ASSESSMENT_WORKERS', min(4, os.cpu_count() or 1)))
+
+def load_vendors_for_assessment(vendor_ids):
+    """Scoring inputs of the given vendors by ID, in one IN query, without loading unused columns"""
+    rows = db.session.execute(
+        db.select(
+            Vendor.id,
+            Vendor.company_name,
+            Vendor.industry,
+            Vendor.employee_count,
+            Vendor.data_processed,
+            Vendor.compliance_frameworks,
+            # Only the dark web flag of the OSINT snapshot is scored
+            Vendor.osint_data['dark_web_exposure']['exposed'].as_boolean().label('dark_web_exposed')
+        ).where(Vendor.id.in_(vendor_ids))
+    ).all()
+    return {row.id: row for row in rows}
+
+def iter_bulk_risk_assessment(vendor_ids, persist=False):
+    """
+    Assess vendors chunk by chunk, yielding each chunk's results in request order
+    
+    Chunks are loaded with one query each. Large requests score chunks on a
+    process pool while the next chunks load; smaller ones score inline.
+    Unknown vendor IDs are skipped. With persist, scores are computed
+    without the random variation, so repeated runs store the same level, and
+    each vendor's risk_score and risk_level are updated.
+    """
+    executor = None
+    if len(vendor_ids) > BULK_ASSESSMENT_PROCESS_THRESHOLD and BULK_ASSESSMENT_WORKERS > 1:
+        # spawn: workers only import risk_calculator, and forking a threaded server is unsafe
+        executor = ProcessPoolExecutor(max_workers=BULK_ASSESSMENT_WORKERS,
+                                       mp_context=multiprocessing.get_context('spawn'))
+    
+    def score(batch):
+        if executor is None:
+            return assess_vendor_batch(batch, deterministic=persist)
+        return executor.submit(assess_vendor_batch, batch, persist)
+    
+    try:
+        pending = []
+        for offset in range(0, len(vendor_ids), BULK_ASSESSMENT_CHUNK_SIZE):
+            chunk = vendor_ids[offset:offset + BULK_ASSESSMENT_CHUNK_SIZE]
+            # Request order of the chunk: an error entry for a malformed ID, else the parsed ID
+            slots = []
+            for vendor_id in chunk:
+                try:
+                    slots.append(int(vendor_id))
+                except (TypeError, ValueError):
+                    slots.append({'vendor_id': vendor_id, 'error': 'Invalid vendor ID'})
+            valid = [slot for slot in slots if isinstance(slot, int)]
+            
+            vendors = load_vendors_for_assessment(set(valid))
+            slots = [slot for slot in slots if not isinstance(slot, int) or slot in vendors]
+            batch = [
+                (vendors[vendor_id].id, vendors[vendor_id].company_name, {
+                    'company_name': vendors[vendor_id].company_name,
+                    'industry': vendors[vendor_id].industry,
+                    'employee_count': vendors[vendor_id].employee_count,
+                    'data_processed': vendors[vendor_id].data_processed,
+                    'compliance_frameworks': vendors[vendor_id].compliance_frameworks
+                }, {'dark_web_exposure': {'exposed': bool(vendors[vendor_id].dark_web_exposed)}})
+                for vendor_id in valid if vendor_id in vendors
+            ]
+            pending.append((slots, score(batch)))
+            
+            # Keep at most one chunk per worker in flight, yielding the oldest first
+            while pending and (executor is None or len(pending) > BULK_ASSESSMENT_WORKERS):
+                yield finish_bulk_assessment_chunk(*pending.pop(0), persist)
+        
+        while pending:
+            yield finish_bulk_assessment_chunk(*pending.pop(0), persist)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def finish_bulk_assessment_chunk(slots, scored, persist):
+    """Results of one chunk in request order, persisted when requested"""
+    results = scored if isinstance(scored, list) else scored.result()
+    if persist:
+        # A vendor listed more than once is updated once
+        updates = list({result['vendor_id']: {'id': result['vendor_id'], 'risk_score': result['risk_score'],
+                                              'risk_level': result['risk_level']}
+                        for result in results if 'error' not in result}.values())
+        if updates:
+            db.session.execute(db.update(Vendor), updates)
+            db.session.commit()
+    
+    scored_results = iter(results)
+    return [next(scored_results) if isinstance(slot, int) else slot for slot in slots]
+
+def stream_bulk_risk_assessment(vendor_ids, persist):
+    """Yield NDJSON lines: one per assessed vendor as its chunk finishes, then a summary"""
+    total = successful = 0
+    for results in iter_bulk_risk_assessment(vendor_ids, persist):
+        for result in results:
+            total += 1
+            successful += 'error' not in result
+            yield json.dumps({'type': 'result', **result}, default=str) + '\n'
+    
+    yield json.dumps({
+        'type': 'summary',
+        'total_assessed': total,
+        'successful_assessments': successful,
+        'persisted': persist,
+        'assessment_date': datetime.utcnow().isoformat()
+    }) + '\n'
+
 @app.route('/api/risk-assessment/bulk', methods=['POST'])
 def bulk_risk_assessment():
-    """Perform bulk risk assessment for multiple vendors"""
+    """Perform bulk risk assessment for multiple vendors
+    
+    Body: {"vendor_ids": [...], "persist": false, "stream": false}. With
+    persist the scores are saved to the vendors; with stream (or
+    Accept: application/x-ndjson) results are sent as NDJSON chunk by chunk.
+    """
     try:
         data = request.get_json()
         vendor_ids = data.get('vendor_ids', [])
@@ -1710,56 +2395,51 @@ def bulk_risk_assessment():
         if not vendor_ids:
             return jsonify({'error': 'No vendor IDs provided'}), 400
         
+        persist = bool(data.get('persist', False))
+        if stream_requested(data):
+            return Response(
+                stream_with_context(stream_bulk_risk_assessment(vendor_ids, persist)),
+                mimetype='application/x-ndjson',
+                headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+            )
+        
         results = []
-        for vendor_id in vendor_ids:
-            try:
-                vendor = Vendor.query.get(vendor_id)
-                if vendor:
-                    # Perform assessment (simplified version)
-                    vendor_data = {
-                        'company_name': vendor.company_name,
-                        'industry': vendor.industry,
-                        'employee_count': vendor.employee_count,
-                        'data_processed': vendor.data_processed,
-                        'compliance_frameworks': vendor.compliance_frameworks
-                    }
-                    
-                    behavioral_risk = AdvancedRiskCalculator.calculate_behavioral_risk(vendor_data)
-                    ml_enhanced_risk = AdvancedRiskCalculator.calculate_ml_enhanced_risk(vendor_data, vendor.osint_data)
-                    
-                    overall_score = (behavioral_risk['score'] + ml_enhanced_risk['score']) / 2
-                    
-                    results.append({
-                        'vendor_id': vendor.id,
-                        'vendor_name': vendor.company_name,
-                        'risk_score': round(overall_score, 2),
-                        'risk_level': RiskCalculator.get_risk_level(overall_score),
-                        'assessment_date': datetime.utcnow().isoformat()
-                    })
-            except Exception as e:
-                results.append({
-                    'vendor_id': vendor_id,
-                    'error': str(e)
-                })
+        for chunk_results in iter_bulk_risk_assessment(vendor_ids, persist):
+            results.extend(chunk_results)
         
         return jsonify({
             'results': results,
             'total_assessed': len(results),
             'successful_assessments': len([r for r in results if 'error' not in r]),
+            'persisted': persist,
             'assessment_date': datetime.utcnow().isoformat()
         })
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/osint/collect/<domain>', methods=['GET'])
 def collect_osint_data(domain):
     """Collect OSINT data for a specific domain"""
     try:
+        profile = probe_profile()
+        invalid = unknown_profile_response(profile)
+        if invalid:
+            return invalid
+        port_profile = port_scan_profile()
+        invalid = unknown_port_profile_response(port_profile)
+        if invalid:
+            return invalid
+        
         # Get Shodan API key from environment
         shodan_api_key = os.getenv('SHODAN_API_KEY')
         
         # Collect OSINT data
-        osint_data = collect_vendor_osint(domain, shodan_api_key)
+        osint_data = collect_vendor_osint(domain, shodan_api_key, cache=osint_cache,
+                                          force_refresh=refresh_requested(),
+                                          single_flight=osint_single_flight,
+                                          deadline=collection_deadline(), profile=profile,
+                                          port_profile=port_profile)
         
         return jsonify({
             'domain': domain,
@@ -1770,31 +2450,74 @@ def collect_osint_data(domain):
     except Exception as e:
         return jsonify({'error': 'Failed to collect OSINT data', 'details': str(e)}), 500
 
+def stream_bulk_osint(domains, options):
+    """Yield NDJSON lines for a bulk OSINT collection without holding results in memory"""
+    counts = {'ok': 0, 'error': 0, 'timeout': 0}
+    
+    for index, domain, osint_data in iter_bulk_vendor_osint(domains, **options):
+        status = osint_result_status(osint_data)
+        counts[status] += 1
+        yield json.dumps({
+            'type': 'result',
+            'index': index,
+            'domain': domain,
+            'status': status,
+            'osint_data': osint_data
+        }, default=str) + '\n'
+    
+    yield json.dumps({
+        'type': 'summary',
+        'total_domains': len(domains),
+        'successful_collections': counts['ok'],
+        'failed_collections': counts['error'],
+        'timed_out_collections': counts['timeout'],
+        'collection_timestamp': datetime.utcnow().isoformat()
+    }) + '\n'
+
 @app.route('/api/osint/bulk-collect', methods=['POST'])
 def bulk_collect_osint():
-    """Collect OSINT data for multiple domains"""
+    """Collect OSINT data for multiple domains
+    
+    With ?stream=true (or "stream": true, or Accept: application/x-ndjson) the
+    response is NDJSON: one line per domain as soon as it completes, then a
+    summary line.
+    """
     try:
-        data = request.get_json()
-        domains = data.get('domains', [])
-        
-        if not domains:
-            return jsonify({'error': 'No domains provided'}), 400
-        
-        # Get Shodan API key from environment
-        shodan_api_key = os.getenv('SHODAN_API_KEY')
+        data = request.get_json() or {}
+        domains, invalid = requested_domains({'domains': data.get('domains', [])}, OSINT_BULK_MAX_DOMAINS)
+        if invalid:
+            return invalid
+        
+        # Checked before the pool starts or a streamed response begins
+        checked, invalid = requested_osint_options(data)
+        if invalid:
+            return invalid
+        options = bulk_osint_options(checked)
+        if refresh_requested():
+            options['force_refresh'] = True
+        
+        if stream_requested(data):
+            return Response(
+                stream_with_context(stream_bulk_osint(domains, options)),
+                mimetype='application/x-ndjson',
+                headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+            )
         
         results = {}
-        for domain in domains:
-            try:
-                osint_data = collect_vendor_osint(domain, shodan_api_key)
-                results[domain] = osint_data
-            except Exception as e:
-                results[domain] = {'error': str(e)}
+        ordered_results = []
+        for domain, osint_data in collect_bulk_vendor_osint(domains, **options):
+            results[domain] = osint_data
+            ordered_results.append({
+                'domain': domain,
+                'status': osint_result_status(osint_data),
+                'osint_data': osint_data
+            })
         
         return jsonify({
             'results': results,
             'total_domains': len(domains),
-            'successful_collections': len([r for r in results.values() if 'error' not in r]),
+            'ordered_results': ordered_results,
+            'successful_collections': len([r for r in ordered_results if r['status'] == 'ok']),
             'collection_timestamp': datetime.utcnow().isoformat()
         }), 200
         
@@ -1805,23 +2528,241 @@ def bulk_collect_osint():
 def get_osint_scores(domain):
     """Get only the risk scores from OSINT collection for a domain"""
     try:
+        profile = probe_profile()
+        invalid = unknown_profile_response(profile)
+        if invalid:
+            return invalid
+        port_profile = port_scan_profile()
+        invalid = unknown_port_profile_response(port_profile)
+        if invalid:
+            return invalid
+        
         # Get Shodan API key from environment
         shodan_api_key = os.getenv('SHODAN_API_KEY')
         
-        # Collect OSINT data
-        osint_data = collect_vendor_osint(domain, shodan_api_key)
+        # Collect OSINT data, served from the cache when every probe is still fresh
+        osint_data = collect_vendor_osint(domain, shodan_api_key, cache=osint_cache,
+                                          force_refresh=refresh_requested(),
+                                          single_flight=osint_single_flight,
+                                          deadline=collection_deadline(), profile=profile,
+                                          port_profile=port_profile)
         
         # Return only the scores
         return jsonify({
             'domain': domain,
+            'profile': osint_data.get('profile', profile),
             'scores': osint_data.get('scores', {}),
             'dark_web_exposure': osint_data.get('dark_web_exposure', {}).get('exposed', False),
+            'cached_probes': osint_data.get('cached_probes', []),
+            'partial': osint_data.get('partial', False),
+            'incomplete_probes': osint_data.get('incomplete_probes', []),
             'collection_timestamp': datetime.utcnow().isoformat()
         }), 200
         
     except Exception as e:
         return jsonify({'error': 'Failed to collect OSINT scores', 'details': str(e)}), 500
 
+@app.route('/api/vendors/<int:vendor_id>/osint/refresh', methods=['POST'])
+def refresh_vendor_osint(vendor_id):
+    """Refresh a vendor's stored OSINT data, re-running only the probes that went stale"""
+    try:
+        vendor = db.session.get(Vendor, vendor_id)
+        if not vendor:
+            return jsonify({'error': 'Vendor not found'}), 404
+        if not vendor.website:
+            return jsonify({'error': 'Vendor has no website to analyze'}), 400
+        
+        data = request.get_json(silent=True) or {}
+        full_refresh = bool(data.get('full', False)) or refresh_requested()
+        profile = probe_profile(data)
+        invalid = unknown_profile_response(profile)
+        if invalid:
+            return invalid
+        port_profile = port_scan_profile(data)
+        invalid = unknown_port_profile_response(port_profile)
+        if invalid:
+            return invalid
+        
+        collector = OSINTCollector(os.getenv('SHODAN_API_KEY'), cache=osint_cache, port_profile=port_profile)
+        osint_data = collector.collect_vendor_intelligence(
+            vendor.website,
+            force_refresh=full_refresh,
+            previous=vendor.osint_data,
+            freshness=data.get('freshness'),
+            deadline=collection_deadline(),
+            profile=profile
+        )
+        
+        vendor.osint_data = osint_data
+        db.session.commit()
+        
+        return jsonify({
+            'vendor_id': vendor.id,
+            'domain': osint_data['domain'],
+            'profile': osint_data['profile'],
+            'refreshed_probes': osint_data['refreshed_probes'],
+            'cached_probes': osint_data['cached_probes'],
+            'partial': osint_data.get('partial', False),
+            'incomplete_probes': osint_data.get('incomplete_probes', []),
+            'scores': osint_data['scores'],
+            'collection_timestamp': datetime.utcnow().isoformat()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to refresh OSINT data', 'details': str(e)}), 500
+
+def serialize_osint_job(job):
+    """Status and progress fields shared by the OSINT job endpoints"""
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'progress': {
+            'total_domains': job.total_domains,
+            'completed_domains': job.completed_domains,
+            'failed_domains': job.failed_domains,
+            'percent_complete': round(job.completed_domains / job.total_domains * 100, 1) if job.total_domains else 100.0
+        },
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@app.route('/api/osint/jobs', methods=['POST'])
+def submit_osint_job():
+    """Queue OSINT collection for one or more domains and return a job ID immediately"""
+    try:
+        data = request.get_json() or {}
+        domains, invalid = requested_domains(data, OSINT_JOB_MAX_DOMAINS)
+        if invalid:
+            return invalid
+        # Checked here, so the runner never picks up a job it cannot run
+        options, invalid = requested_osint_options(data)
+        if invalid:
+            return invalid
+        
+        job = OSINTJob(
+            domains=domains,
+            options=options,
+            total_domains=len(domains)
+        )
+        db.session.add(job)
+        db.session.commit()
+        
+        osint_job_runner.notify()
+        
+        return jsonify({
+            **serialize_osint_job(job),
+            'status_url': f'/api/osint/jobs/{job.id}',
+            'results_url': f'/api/osint/jobs/{job.id}/results'
+        }), 202
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to submit OSINT job', 'details': str(e)}), 500
+
+@app.route('/api/osint/jobs/<job_id>', methods=['GET'])
+def get_osint_job(job_id):
+    """Get status and progress of an OSINT job"""
+    try:
+        job = db.session.get(OSINTJob, job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(serialize_osint_job(job)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/osint/jobs/<job_id>/results', methods=['GET'])
+def get_osint_job_results(job_id):
+    """Get the results collected so far for an OSINT job"""
+    try:
+        job = db.session.get(OSINTJob, job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 50, type=int)
+        
+        results = OSINTJobResult.query.filter_by(job_id=job.id).order_by(OSINTJobResult.position).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        
+        return jsonify({
+            **serialize_osint_job(job),
+            'results': [{
+                'position': result.position,
+                'domain': result.domain,
+                'status': result.status,
+                'osint_data': result.osint_data,
+                'completed_at': result.completed_at.isoformat() if result.completed_at else None
+            } for result in results.items],
+            'pagination': {
+                'page': results.page,
+                'pages': results.pages,
+                'per_page': results.per_page,
+                'total': results.total
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Vendors loaded and re-scored per batch by the OSINT rescore endpoint
+OSINT_RESCORE_BATCH_SIZE = int(os.getenv('OSINT_RESCORE_BATCH_SIZE', 5000))
+
+@app.route('/api/osint/rescore', methods=['POST'])
+def rescore_vendor_osint():
+    """Recalculate the OSINT scores of every stored vendor snapshot without re-collecting"""
+    try:
+        data = request.get_json(silent=True) or {}
+        dry_run = bool(data.get('dry_run', False))
+        started = datetime.utcnow()
+        rescored = changed = 0
+        last_id = 0
+        
+        # Walk vendors in primary key order so each batch is one indexed range scan
+        while True:
+            rows = db.session.execute(
+                db.select(Vendor.id, Vendor.osint_data)
+                .where(Vendor.id > last_id, Vendor.osint_data.isnot(None))
+                .order_by(Vendor.id)
+                .limit(OSINT_RESCORE_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            
+            snapshots = [row.osint_data for row in rows if isinstance(row.osint_data, dict)]
+            ids = [row.id for row in rows if isinstance(row.osint_data, dict)]
+            updates = []
+            for vendor_id, snapshot, scores in zip(ids, snapshots, batch_calculate_scores(snapshots)):
+                # Keep score keys the OSINT scorer does not produce, and only the scores the snapshot's probes back
+                backed = backed_score_keys(name for name in PROBE_REGISTRY if isinstance(snapshot.get(name), dict))
+                merged = {**{key: value for key, value in (snapshot.get('scores') or {}).items() if key not in SCORE_NAMES},
+                          **{key: value for key, value in scores.items() if key in backed}}
+                if merged != snapshot.get('scores'):
+                    updates.append({'id': vendor_id, 'osint_data': {**snapshot, 'scores': merged}})
+            
+            rescored += len(snapshots)
+            changed += len(updates)
+            if updates and not dry_run:
+                db.session.execute(db.update(Vendor), updates)
+                db.session.commit()
+                # Bulk updates bypass the flush hook that maintains AI reports
+                sync_ai_reports([update['id'] for update in updates])
+        
+        return jsonify({
+            'rescored': rescored,
+            'changed': changed,
+            'dry_run': dry_run,
+            'duration_seconds': round((datetime.utcnow() - started).total_seconds(), 3)
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to rescore OSINT data', 'details': str(e)}), 500
+
 @app.route('/api/vendors/<int:vendor_id>/report', methods=['GET'])
 def export_vendor_report(vendor_id):
     """Export vendor report as PDF or JSON"""
@@ -1904,10 +2845,18 @@ def health_check():
         'database': 'connected'
     }), 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """OSINT probe metrics in Prometheus text format"""
+    return Response(get_default_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == '__main__':
     with app.app_context():
         # Create tables if they don't exist (don't drop in production)
         db.create_all()
+        create_missing_indexes()
+        backfill_security_gap_tags()
+        sync_ai_reports(missing_only=True)
         # Generate mock data if no clients exist
         if Client.query.count() == 0:
             MockDataGenerator.generate_mock_clients()
@@ -1915,6 +2864,8 @@ if __name__ == '__main__':
         if Vendor.query.count() == 0:
             MockDataGenerator.generate_mock_vendors()
     
+    start_osint_job_runner()
+    
     # Use Railway's PORT environment variable or default to 5000
     port = int(os.environ.get('PORT', 5000))
     app.run(debug=False, host='0.0.0.0', port=port) 
\ No newline at end of file
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Offline OSINT collector benchmark
+
+Runs the collector against the local testbed (osint_testbed.py) and reports
+per-domain latency, bulk throughput and peak Python memory for batches of
+1, 100 and 1000 domains. Nothing leaves the machine, so runs are comparable
+between commits.
+
+With --verify it instead checks that osint_scoring.batch_calculate_scores
+gives the same scores as OSINTCollector._calculate_scores for varied
+testbed snapshots, and exits non-zero on any difference.
+
+    python benchmark_osint.py
+    python benchmark_osint.py --sizes 1,100 --workers 16 --http-delay 0.05 --json
+    python benchmark_osint.py --verify
+"""
+
+import argparse
+import copy
+import datetime
+import itertools
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+from osint_collector import OSINTCollector, iter_bulk_vendor_osint
+from osint_scoring import SCORE_NAMES, batch_calculate_scores
+from osint_testbed import DEFAULT_HEADERS, TESTBED_ZONE, OSINTTestbed
+
+# Domains collected one by one to measure single-collection latency
+LATENCY_SAMPLE = 25
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def measure_latency(domains, collector_options):
+    """Collect a sample of domains sequentially and summarize their durations"""
+    durations = []
+    probe_timings = {}
+    for domain in domains[:LATENCY_SAMPLE]:
+        collector = OSINTCollector(**collector_options)
+        result = collector.collect_vendor_intelligence(domain, force_refresh=True)
+        durations.append(result["collection_duration"])
+        for probe, seconds in result["probe_timings"].items():
+            probe_timings.setdefault(probe, []).append(seconds)
+
+    return {
+        "samples": len(durations),
+        "p50": round(percentile(durations, 0.5), 4),
+        "p95": round(percentile(durations, 0.95), 4),
+        "max": round(max(durations), 4),
+        "probe_mean": {probe: round(statistics.mean(values), 4) for probe, values in probe_timings.items()}
+    }
+
+def measure_bulk(domains, collector_options, workers):
+    """Collect every domain on the bulk pool, timing it and tracking peak traced memory"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    outcomes = {"ok": 0, "error": 0}
+    for _, _, result in iter_bulk_vendor_osint(domains, max_workers=workers, **collector_options):
+        outcomes["error" if "error" in result else "ok"] += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "domains": len(domains),
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "domains_per_second": round(len(domains) / elapsed, 2) if elapsed else None,
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        **outcomes
+    }
+
+def run_benchmark(sizes, workers, http_delay, dns_delay, whois_delay):
+    """Benchmark each batch size against a fresh testbed"""
+    report = []
+    for size in sizes:
+        with OSINTTestbed() as testbed:
+            domains = testbed.add_domains(size, http_delay=http_delay, dns_delay=dns_delay,
+                                          whois_delay=whois_delay)
+            collector_options = testbed.collector_options()
+
+            report.append({
+                "size": size,
+                "latency": measure_latency(domains, collector_options),
+                "bulk": measure_bulk(domains, collector_options, workers)
+            })
+    return report
+
+def verification_fixtures():
+    """FixtureDomain options covering the branches of every score"""
+    security_headers = [name for name in DEFAULT_HEADERS if name != "Server"]
+    header_sets = [dict(DEFAULT_HEADERS), {}] + [
+        {name: DEFAULT_HEADERS[name] for name in security_headers[:count]} for count in range(1, len(security_headers))
+    ]
+    today = datetime.date.today()
+    creation_dates = [
+        "2010-06-01 00:00:00",
+        (today - datetime.timedelta(days=100)).isoformat(),
+        (today - datetime.timedelta(days=500)).isoformat(),
+        (today - datetime.timedelta(days=2000)).isoformat(),
+        "not a date",
+        None
+    ]
+    email_records = [
+        {},
+        {"dmarc_record": None},
+        {"mx_records": [], "txt_records": []},
+        {"dmarc_record": None, "mx_records": [], "txt_records": ["google-site-verification=testbed"]}
+    ]
+    for headers, creation_date, email in zip(itertools.cycle(header_sets), creation_dates * len(email_records),
+                                             (record for record in email_records for _ in creation_dates)):
+        yield {"headers": headers, "creation_date": creation_date, **email}
+
+# Certificate and open port details the testbed always serves the same way
+SSL_VARIANTS = [
+    {"cipher_suite": "ECDHE-RSA-AES128-GCM-SHA256", "days_until_expiry": 365},
+    {"cipher_suite": "TLS_ECDHE_RSA_WITH_AES_128_GCM_SHA256", "days_until_expiry": 60},
+    {"cipher_suite": "TLS_CHACHA20_POLY1305_SHA256", "days_until_expiry": 10},
+    {"cipher_suite": "TLS_AES_256_GCM_SHA384", "days_until_expiry": -5}
+]
+PORT_VARIANTS = [[], [22, 80, 443], [21, 23, 25, 110, 143, 3306, 3389, 5432, 8080]]
+
+def snapshot_variants(snapshot):
+    """Copies of a snapshot with other certificate, port and exposure details, or with one
+    probe section replaced by an error or missing, as a failed probe leaves it"""
+    for ssl_details in SSL_VARIANTS:
+        if isinstance(snapshot.get("ssl_info"), dict) and snapshot["ssl_info"].get("certificate_valid"):
+            variant = copy.deepcopy(snapshot)
+            variant["ssl_info"].update(ssl_details)
+            yield variant
+    for open_ports in PORT_VARIANTS:
+        variant = copy.deepcopy(snapshot)
+        variant["port_scan"] = {**variant.get("port_scan", {}), "open_ports": open_ports}
+        yield variant
+    variant = copy.deepcopy(snapshot)
+    variant["dark_web_exposure"] = {"exposed": True}
+    yield variant
+    for section in ("ssl_info", "dns_info", "http_headers", "port_scan", "basic_info"):
+        variant = copy.deepcopy(snapshot)
+        variant[section] = {"error": "probe failed"}
+        yield variant
+        variant = copy.deepcopy(snapshot)
+        variant.pop(section, None)
+        yield variant
+
+def verify_scores(workers):
+    """Compare the vectorized scores with the collector's own on testbed snapshots
+
+    Returns:
+        List of (domain, score name, collector score, vectorized score) that differ
+    """
+    snapshots = []
+    with OSINTTestbed() as testbed:
+        domains = []
+        for index, options in enumerate(verification_fixtures()):
+            domains.append(testbed.add_domain(f"verify{index:03d}.{TESTBED_ZONE}", **options).name)
+        for _, _, result in iter_bulk_vendor_osint(domains, max_workers=workers, **testbed.collector_options()):
+            snapshots.append(result)
+            snapshots.extend(snapshot_variants(result))
+
+    collector = OSINTCollector()
+    expected = [collector._calculate_scores(snapshot) for snapshot in snapshots]
+    actual = batch_calculate_scores(snapshots)
+    return [
+        (snapshot.get("domain"), name, want[name], got[name])
+        for snapshot, want, got in zip(snapshots, expected, actual)
+        for name in SCORE_NAMES
+        if want[name] != got[name]
+    ], len(snapshots)
+
+def print_report(report):
+    print("🔍 OSINT Collector Benchmark")
+    print("=" * 72)
+    print(f"{'domains':>8} {'p50 s':>8} {'p95 s':>8} {'bulk s':>8} {'dom/s':>8} {'peak MB':>8} {'errors':>7}")
+    for entry in report:
+        latency, bulk = entry["latency"], entry["bulk"]
+        print(f"{entry['size']:>8} {latency['p50']:>8} {latency['p95']:>8} {bulk['seconds']:>8} "
+              f"{bulk['domains_per_second']:>8} {bulk['peak_memory_mb']:>8} {bulk['error']:>7}")
+
+    print("\nMean probe time (s) in the latency sample of the largest batch:")
+    for probe, seconds in report[-1]["latency"]["probe_mean"].items():
+        print(f"  {probe:<20} {seconds}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OSINT collector against the local testbed")
+    parser.add_argument("--sizes", default="1,100,1000", help="Comma separated batch sizes")
+    parser.add_argument("--workers", type=int, default=8, help="Bulk worker pool size")
+    parser.add_argument("--http-delay", type=float, default=0.0, help="Seconds the web servers wait per request")
+    parser.add_argument("--dns-delay", type=float, default=0.0, help="Seconds the DNS server waits per query")
+    parser.add_argument("--whois-delay", type=float, default=0.0, help="Seconds each WHOIS lookup takes")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check the vectorized scores against the collector's instead of benchmarking")
+    args = parser.parse_args()
+
+    # Per-probe log lines would dominate the run time at 1000 domains
+    logging.disable(logging.WARNING)
+
+    if args.verify:
+        mismatches, checked = verify_scores(args.workers)
+        for domain, name, expected, actual in mismatches:
+            print(f"❌ {domain} {name}: collector {expected}, vectorized {actual}")
+        print(f"{'❌' if mismatches else '✅'} {len(mismatches)} mismatched scores in {checked} snapshots")
+        return 1 if mismatches else 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run_benchmark(sizes, args.workers, args.http_delay, args.dns_delay, args.whois_delay)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
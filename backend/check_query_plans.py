@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Query plan check for the list endpoints
+
+Fills an empty database with synthetic vendors, alerts, monitoring events
+and risk assessments (1M rows each by default), runs ANALYZE and EXPLAINs
+the exact queries the list endpoints issue, in offset and cursor mode. A check fails when the plan
+reads a table without an index, or sorts the rows itself, where the model
+indexes should have avoided it. Exits non-zero on any failure.
+
+    python check_query_plans.py
+    python check_query_plans.py --rows 100000
+    DATABASE_URL=postgresql://... python check_query_plans.py --rows 1000000
+
+Without DATABASE_URL a throwaway SQLite file is used. Tables that already
+hold rows are not filled, so the check can also be pointed at a copy of
+production data.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# app reads its configuration at import time
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'scope_query_plans.db'))
+os.environ.setdefault('OSINT_JOB_RUNNER_ENABLED', 'false')
+
+from app import (app, db, Client, MonitoringEvent, RiskAssessment, SecurityAlert, Vendor, alert_list_query,
+                 create_missing_indexes, latest_risk_assessment, monitoring_event_list_query, vendor_list_query)
+from pagination import encode_cursor, keyset_query
+
+RISK_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+INDUSTRIES = ('Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing', 'Energy', 'Education', 'Logistics')
+ALERT_STATUSES = ('Active', 'Acknowledged', 'Resolved')
+EVENT_TYPES = ('SSL_Expiry', 'Domain_Change', 'Dark_Web_Exposure', 'Port_Change', 'Header_Change')
+
+# Rows inserted per statement while filling tables
+INSERT_BATCH = 10000
+
+def created_at(rng, start=datetime(2020, 1, 1)):
+    return start + timedelta(seconds=rng.randrange(5 * 365 * 24 * 3600))
+
+def fill(model, count, make_row, rng):
+    """Insert count synthetic rows into an empty table"""
+    if db.session.execute(db.select(db.func.count()).select_from(model)).scalar():
+        print(f"  {model.__tablename__}: already has rows, left as is")
+        return
+    started = time.perf_counter()
+    for offset in range(0, count, INSERT_BATCH):
+        db.session.execute(db.insert(model), [make_row(rng, offset + i) for i in range(min(INSERT_BATCH, count - offset))])
+        db.session.commit()
+    print(f"  {model.__tablename__}: {count} rows in {time.perf_counter() - started:.1f}s")
+
+def load(rows, seed):
+    """Fill the checked tables; vendors and clients are a tenth of the other tables"""
+    rng = random.Random(seed)
+    parents = max(1, rows // 10)
+    fill(Vendor, parents, lambda rng, i: {
+        'company_name': f'Vendor {i}', 'contact_name': 'Contact', 'contact_email': f'contact{i}@vendor.test',
+        'industry': rng.choice(INDUSTRIES), 'employee_count': '51-200', 'risk_level': rng.choice(RISK_LEVELS),
+        'risk_score': rng.random() * 100, 'created_at': created_at(rng), 'updated_at': created_at(rng)
+    }, rng)
+    fill(Client, parents, lambda rng, i: {
+        'company_name': f'Client {i}', 'sector': rng.choice(INDUSTRIES), 'country': 'US',
+        'continent': 'North America', 'region': 'West', 'domain': f'client{i}.test', 'created_at': created_at(rng)
+    }, rng)
+    fill(SecurityAlert, rows, lambda rng, i: {
+        'vendor_id': rng.randrange(1, parents + 1), 'alert_type': 'OSINT', 'severity': rng.choice(RISK_LEVELS),
+        'title': 'Synthetic alert', 'description': 'Synthetic alert', 'status': rng.choice(ALERT_STATUSES),
+        'created_at': created_at(rng)
+    }, rng)
+    fill(MonitoringEvent, rows, lambda rng, i: {
+        'vendor_id': rng.randrange(1, parents + 1), 'event_type': rng.choice(EVENT_TYPES), 'event_data': {},
+        'severity': rng.choice(RISK_LEVELS), 'created_at': created_at(rng)
+    }, rng)
+    fill(RiskAssessment, rows, lambda rng, i: {
+        'client_id': rng.randrange(1, parents + 1), 'overall_risk_score': rng.random() * 100,
+        'risk_level': rng.choice(RISK_LEVELS), 'assessment_date': created_at(rng)
+    }, rng)
+
+# A cursor deep into the synthetic data, for the keyset page checks
+DEEP_CURSOR_AT = datetime(2022, 6, 1)
+
+def page_and_count(name, query, model, per_page=10):
+    """The statements behind a list endpoint: paginate()'s page and count, and deep keyset pages"""
+    statements = [
+        (f"{name} page", query.limit(per_page).offset(0).statement, True),
+        (f"{name} count", db.select(db.func.count()).select_from(query.order_by(None).subquery()), False)
+    ]
+    for direction in ("next", "prev"):
+        keyset, _ = keyset_query(query, model, encode_cursor(DEEP_CURSOR_AT, 500000, direction))
+        statements.append((f"{name} cursor {direction}", keyset.limit(per_page + 1).statement, True))
+    return statements
+
+def checks():
+    """(name, statement, must avoid sorting) for every checked query"""
+    latest, latest_join = latest_risk_assessment()
+    statements = []
+    statements += page_and_count("vendors", vendor_list_query(), Vendor)
+    statements += page_and_count("vendors?risk_level", vendor_list_query(risk_level='High'), Vendor)
+    statements += page_and_count("vendors?industry", vendor_list_query(industry='Finance'), Vendor)
+    statements += page_and_count("alerts (status=Active)", alert_list_query(status='Active'), SecurityAlert)
+    statements += page_and_count("alerts?severity", alert_list_query(severity='Critical', status='Active'),
+                                  SecurityAlert)
+    statements += page_and_count("alerts?vendor_id", alert_list_query(status='Active', vendor_id=7), SecurityAlert)
+    statements += page_and_count("monitoring/events", monitoring_event_list_query(), MonitoringEvent)
+    statements += page_and_count("monitoring/events?vendor_id", monitoring_event_list_query(vendor_id=7),
+                                  MonitoringEvent)
+    statements += page_and_count("monitoring/events?event_type", monitoring_event_list_query(event_type='SSL_Expiry'),
+                                  MonitoringEvent)
+    statements.append(("vendor import name lookup", db.select(Vendor.id, Vendor.company_name).where(
+        Vendor.company_name.in_(['Vendor 7', 'Vendor 70', 'Vendor 700'])), False))
+    statements.append(("client latest assessment", db.select(RiskAssessment).filter_by(client_id=7).order_by(
+        RiskAssessment.assessment_date.desc(), RiskAssessment.id.desc()).limit(1), True))
+    statements.append(("latest assessment per client (dashboard)", db.select(latest.risk_level, db.func.count())
+                       .select_from(Client).join(latest, latest_join).group_by(latest.risk_level), False))
+    return statements
+
+def explain(statement):
+    """Plan lines for a statement on the configured database"""
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == 'sqlite':
+        return [row[-1] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"))]
+    return [row[0] for row in db.session.execute(db.text(f"EXPLAIN {sql}"))]
+
+def plan_problems(plan, dialect, ordered):
+    """Reasons a plan does not use the indexes as intended"""
+    problems = []
+    for line in plan:
+        if dialect == 'sqlite':
+            full_scan = re.match(r'\s*SCAN (\w+)\s*$', line)
+            if full_scan and not full_scan.group(1).startswith(('anon', '(')):
+                problems.append(f"full table scan: {line.strip()}")
+            if ordered and 'TEMP B-TREE' in line:
+                problems.append(f"sorts rows: {line.strip()}")
+        else:
+            if 'Seq Scan' in line:
+                problems.append(f"full table scan: {line.strip()}")
+            if ordered and re.match(r'\s*(->\s*)?(Incremental )?Sort\b', line):
+                problems.append(f"sorts rows: {line.strip()}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the list endpoint queries against a large synthetic dataset")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows per event-like table (alerts, events, assessments)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic data")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only failing ones")
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(f"Database: {db.engine.url.render_as_string(hide_password=True)}")
+        db.create_all()
+        created = create_missing_indexes()
+        if created:
+            print(f"Created indexes: {', '.join(created)}")
+        load(args.rows, args.seed)
+        db.session.execute(db.text("ANALYZE"))
+        db.session.commit()
+
+        dialect = db.engine.dialect.name
+        statements = checks()
+        failures = 0
+        for name, statement, ordered in statements:
+            plan = explain(statement)
+            problems = plan_problems(plan, dialect, ordered)
+            failures += bool(problems)
+            print(f"{'FAIL' if problems else 'ok  '}  {name}")
+            for problem in problems:
+                print(f"        {problem}")
+            if problems or args.verbose:
+                for line in plan:
+                    print(f"        | {line}")
+
+    print(f"{failures} of {len(statements)} checks failed" if failures else "All queries use an index")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+# Gunicorn settings, read from the working directory by `gunicorn app:app`
+
+def post_worker_init(worker):
+    """Start the OSINT job runner as soon as a worker has loaded the app
+
+    Without it a worker would only pick up queued jobs, and jobs left
+    running by a restart, once it served its first request.
+    """
+    from app import start_osint_job_runner
+    start_osint_job_runner()
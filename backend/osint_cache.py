@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# How long each probe's output stays fresh, in seconds
+PROBE_TTLS = {
+    "basic_info": 3 * 24 * 3600,        # WHOIS data rarely changes
+    "ssl_info": 6 * 3600,
+    "dns_info": 3600,
+    "http_headers": 15 * 60,
+    "port_scan": 15 * 60,
+    "shodan_data": 24 * 3600,
+    "dark_web_exposure": 24 * 3600
+}
+
+DEFAULT_PROBE_TTL = 15 * 60
+
+class OSINTResultCache:
+    """Thread-safe, bounded LRU cache of OSINT probe results keyed by normalized domain"""
+
+    def __init__(self, max_entries: int = 1000, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of domains kept before the least recently used is evicted
+            ttls: Per-probe time to live in seconds, merged over PROBE_TTLS
+        """
+        self.max_entries = max_entries
+        self.ttls = {**PROBE_TTLS, **(ttls or {})}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, probe: str) -> float:
+        """Time to live in seconds for a probe's results"""
+        return self.ttls.get(probe, DEFAULT_PROBE_TTL)
+
+    def get(self, domain: str, probe: str, variant: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get a fresh cached probe result
+
+        Args:
+            domain: Normalized domain
+            probe: Result key of the probe, e.g. "ssl_info"
+            variant: Probe options the result depends on, e.g. the port profile of a port scan
+
+        Returns:
+            Cached result, or None when missing or expired
+        """
+        entry = self.get_entry(domain, probe, variant)
+        return entry[0] if entry else None
+
+    def get_entry(self, domain: str, probe: str, variant: Optional[str] = None) -> Optional[Tuple[Dict, float]]:
+        """Get a fresh cached probe result together with the time it was stored"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            cached = entry.get((probe, variant)) if entry else None
+
+            if cached is None or time.time() - cached[1] > self.ttl_for(probe):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(domain)
+            self.hits += 1
+            return cached
+
+    def put(self, domain: str, probe: str, value: Dict, stored_at: Optional[float] = None,
+            variant: Optional[str] = None) -> None:
+        """Store a probe result, evicting the least recently used domain when full"""
+        with self._lock:
+            entry = self._entries.setdefault(domain, {})
+            entry[(probe, variant)] = (value, stored_at if stored_at is not None else time.time())
+            self._entries.move_to_end(domain)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, domain: Optional[str] = None) -> None:
+        """Drop cached results for one domain, or for every domain"""
+        with self._lock:
+            if domain is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(domain, None)
+
+    def stats(self) -> Dict:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -1,40 +1,366 @@
-import whois
+import asyncio
 import ssl
 import socket
+import dns.asyncresolver
 import dns.resolver
 import dns.reversename
 import requests
+import urllib3
 import json
 import time
 import threading
-from typing import Dict, List, Optional, Tuple
+import types
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 import logging
+from osint_cache import DEFAULT_PROBE_TTL, PROBE_TTLS, OSINTResultCache
+from osint_metrics import (ProbeMetrics, add_bytes, get_default_metrics, probe_outcome,
+                           start_byte_count, stop_byte_count)
+from osint_singleflight import SingleFlight
+from whois_cache import WhoisLookupQueue, get_default_whois_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Port lists used by the port scan probe
+PORT_PROFILES = {
+    # Original fixed list of common service ports
+    "common": [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3306, 3389, 5432, 8080, 8443],
+    # Nmap's 100 most frequently open TCP ports
+    "top100": [
+        7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135,
+        139, 143, 144, 179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548,
+        554, 587, 631, 646, 873, 990, 993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433,
+        1720, 1723, 1755, 1900, 2000, 2001, 2049, 2121, 2717, 3000, 3128, 3306, 3389, 3986,
+        4899, 5000, 5009, 5051, 5060, 5101, 5190, 5357, 5432, 5631, 5666, 5800, 5900, 6000,
+        6001, 6646, 7070, 8000, 8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999, 10000,
+        32768, 49152, 49153, 49154, 49155, 49156, 49157
+    ],
+    # Every privileged port
+    "well_known": list(range(1, 1025))
+}
+
+# DNS answers shared by every collector in the process. dnspython honours record
+# TTLs and also caches NXDOMAIN/NODATA answers, so vendors that share mail and
+# nameserver providers stop paying a round trip per rescan.
+DNS_ANSWER_CACHE = dns.resolver.LRUCache(max_size=50000)
+
+# Connection pool size of the shared HTTP session, sized for concurrent scans
+HTTP_POOL_SIZE = 64
+
+# Longest header value kept in http_headers["all_headers"]
+MAX_HEADER_VALUE_LENGTH = 512
+
+# Connect and read timeout of the TLS and HTTP probes in seconds
+HTTP_TIMEOUT = 10
+
+# Smallest timeout handed to a probe near the collection deadline; a zero
+# socket timeout would switch the socket to non-blocking mode instead
+MIN_PROBE_TIMEOUT = 0.1
+
+# Most body bytes the GET header probe reads so its connection can go back to
+# the pool; a longer body is cheaper to drop along with the connection
+HTTP_DRAIN_LIMIT = 64 * 1024
+
+# Request header naming the address a probe request should connect to, as
+# "hostname=address". It is consumed by PinnedAddressAdapter and never sent.
+PINNED_ADDRESS_HEADER = 'X-Scope-Pinned-Address'
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+_ssl_context = None
+_ssl_context_lock = threading.Lock()
+
+def describe_tls_session(ssock: ssl.SSLSocket) -> Dict:
+    """Certificate and cipher facts of an established, verified TLS connection"""
+    cert = ssock.getpeercert()
+
+    # Get cipher info
+    cipher = ssock.cipher()
+
+    # Check certificate details
+    subject = dict(x[0] for x in cert['subject'])
+    issuer = dict(x[0] for x in cert['issuer'])
+
+    # Parse dates
+    not_before = ssl.cert_time_to_seconds(cert['notBefore'])
+    not_after = ssl.cert_time_to_seconds(cert['notAfter'])
+
+    # Calculate days until expiration
+    days_until_expiry = (not_after - time.time()) / (24 * 3600)
+
+    return {
+        "certificate_valid": True,
+        "subject": subject,
+        "issuer": issuer,
+        "not_before": cert['notBefore'],
+        "not_after": cert['notAfter'],
+        "days_until_expiry": int(days_until_expiry),
+        "cipher_suite": cipher[0] if cipher else None,
+        "cipher_version": cipher[1] if cipher else None,
+        "cipher_bits": cipher[2] if cipher else None,
+        "protocol_version": ssock.version(),
+        "san_domains": cert.get('subjectAltName', [])
+    }
+
+class TLSRecordingHTTPSConnection(urllib3.connection.HTTPSConnection):
+    """HTTPS connection that keeps the TLS facts of its handshake as tls_session
+    
+    They stay readable from a response after the server closes the
+    connection, when the socket itself is already gone.
+    """
+    
+    tls_session = None
+    
+    def connect(self):
+        super().connect()
+        self.tls_session = None
+        if isinstance(self.sock, ssl.SSLSocket) and self.sock.getpeercert():
+            self.tls_session = describe_tls_session(self.sock)
+
+class TLSRecordingHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = TLSRecordingHTTPSConnection
+
+class PinnedAddressAdapter(requests.adapters.HTTPAdapter):
+    """HTTP adapter that connects to an address the collector already resolved
+    
+    Requests carrying PINNED_ADDRESS_HEADER go to the given address instead of
+    resolving the hostname again. TLS still verifies the certificate against
+    the hostname, and redirects to other hosts resolve normally. HTTPS
+    connections record their TLS facts (see response_tls_session).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._local = threading.local()
+        super().__init__(*args, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {**self.poolmanager.pool_classes_by_scheme,
+                                                   'https': TLSRecordingHTTPSConnectionPool}
+    
+    def send(self, request, **kwargs):
+        pin = request.headers.get(PINNED_ADDRESS_HEADER)
+        if pin is None:
+            return super().send(request, **kwargs)
+        
+        # Strip the header from a copy so redirects made from the original keep the pin
+        request = request.copy()
+        del request.headers[PINNED_ADDRESS_HEADER]
+        
+        host, _, address = pin.partition('=')
+        parsed = urlparse(request.url)
+        if parsed.hostname != host or not address:
+            return super().send(request, **kwargs)
+        
+        # The pool is keyed by address, so the Host header has to name the site
+        request.headers.setdefault('Host', parsed.netloc)
+        self._local.pinned = (host, address)
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            self._local.pinned = None
+    
+    def get_connection(self, url, proxies=None):
+        pinned = getattr(self._local, 'pinned', None)
+        if pinned is None or requests.utils.select_proxy(url, proxies):
+            return super().get_connection(url, proxies)
+        
+        host, address = pinned
+        parsed = urlparse(url)
+        pool_kwargs = {}
+        if parsed.scheme == 'https':
+            pool_kwargs = {'server_hostname': host, 'assert_hostname': host}
+        return self.poolmanager.connection_from_host(
+            address, port=parsed.port, scheme=parsed.scheme, pool_kwargs=pool_kwargs
+        )
+
+def response_tls_session(response: requests.Response) -> Optional[Dict]:
+    """TLS facts of the connection a response arrived on, when a PinnedAddressAdapter made it"""
+    return getattr(getattr(response.raw, 'connection', None), 'tls_session', None)
+
+def get_shared_session() -> requests.Session:
+    """Process-wide HTTP session whose connection pool is shared by all collectors"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = PinnedAddressAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'User-Agent': 'SCOPE-OSINT-Collector/1.0'
+            })
+            _shared_session = session
+        return _shared_session
+
+def normalize_domain(domain: str) -> str:
+    """Normalize domain by removing protocol and path"""
+    if domain.startswith(('http://', 'https://')):
+        domain = urlparse(domain).netloc
+    return domain.lower().strip().rstrip('.')
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Process-wide verifying SSL context, so the CA store is loaded only once"""
+    global _ssl_context
+    with _ssl_context_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+class CollectionContext:
+    """State shared by the probes of one collection
+    
+    The domain is resolved once, on first use, and every probe connects to the
+    same addresses. The HTTPS header probe publishes the TLS facts of its
+    handshake here so the SSL probe does not need a handshake of its own.
+    Finished probe results are collected in results, where probes find the
+    output of the probes they depend on.
+    """
+    
+    def __init__(self, domain: str, resolve: Callable[[str, Optional[float]], List[str]],
+                 share_tls: bool = False, deadline_at: Optional[float] = None):
+        """
+        Args:
+            domain: Normalized domain being collected
+            resolve: Function returning the domain's addresses within a time limit
+            share_tls: Whether an HTTPS header probe will publish its TLS facts
+            deadline_at: time.monotonic() value by which the collection must finish
+        """
+        self.domain = domain
+        self.deadline_at = deadline_at
+        self._resolve = resolve
+        self._addresses = None
+        self._lock = threading.Lock()
+        self.results = {}
+        self.tls_info = None
+        self.tls_ready = threading.Event()
+        if not share_tls:
+            self.tls_ready.set()
+    
+    def addresses(self) -> List[str]:
+        """Addresses of the domain, IPv4 first; empty when it does not resolve"""
+        with self._lock:
+            if self._addresses is None:
+                self._addresses = self._resolve(self.domain, self.remaining())
+            return self._addresses
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the collection deadline, or None without one"""
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - time.monotonic())
+    
+    def timeout(self, default: float) -> float:
+        """A probe timeout capped by the remaining collection budget"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(MIN_PROBE_TIMEOUT, min(default, remaining))
+    
+    def preferred_address(self) -> Optional[str]:
+        """Address probes connect to, preferring IPv4"""
+        addresses = self.addresses()
+        return next((address for address in addresses if ':' not in address),
+                    addresses[0] if addresses else None)
+    
+    def publish_tls(self, tls_info: Optional[Dict]) -> None:
+        """Hand TLS facts to a waiting SSL probe, or None to let it connect itself"""
+        if not self.tls_ready.is_set():
+            self.tls_info = tls_info
+            self.tls_ready.set()
+
 class OSINTCollector:
-    def __init__(self, shodan_api_key: Optional[str] = None):
+    def __init__(self, shodan_api_key: Optional[str] = None, concurrent: bool = True,
+                 max_workers: int = 8, port_profile: str = "common",
+                 ports: Optional[List[int]] = None, port_timeout: float = 2.0,
+                 port_concurrency: int = 100, port_scan_deadline: float = 10.0,
+                 cache: Optional[OSINTResultCache] = None,
+                 whois_queue: Optional[WhoisLookupQueue] = None,
+                 http_probe_mode: str = "head", session: Optional[requests.Session] = None,
+                 metrics: Optional[ProbeMetrics] = None,
+                 dns_nameservers: Optional[List[str]] = None, dns_port: int = 53,
+                 https_port: int = 443, http_port: int = 80, ca_bundle: Optional[str] = None):
         """
         Initialize OSINT collector with optional Shodan API key
         
         Args:
             shodan_api_key: Optional Shodan API key for enhanced scanning
+            concurrent: Run independent probes in parallel instead of one after another
+            max_workers: Maximum number of probes running at the same time
+            port_profile: Name of the PORT_PROFILES entry to scan
+            ports: Explicit port list, overrides port_profile
+            port_timeout: Connect timeout per port in seconds
+            port_concurrency: Maximum number of ports probed at the same time
+            port_scan_deadline: Overall time limit for one port scan in seconds
+            cache: Optional probe result cache consulted before running each probe
+            whois_queue: WHOIS lookup queue, defaults to the shared persistent one
+            http_probe_mode: "head" to try HEAD before a body-less GET, "stream" for the GET only
+            session: HTTP session, defaults to the shared pooled one
+            metrics: Probe metrics recorder, defaults to the process-wide one
+            dns_nameservers: Query these nameservers instead of the system's, e.g. a test server
+            dns_port: Port of dns_nameservers
+            https_port: Port the TLS and HTTPS header probes connect to
+            http_port: Port the plain HTTP header probe connects to
+            ca_bundle: CA certificates to verify TLS against instead of the system store
         """
+        if ports is None and port_profile not in PORT_PROFILES:
+            raise ValueError(f"Unknown port profile: {port_profile}")
+        if http_probe_mode not in ("head", "stream"):
+            raise ValueError(f"Unknown HTTP probe mode: {http_probe_mode}")
+        
         self.shodan_api_key = shodan_api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'SCOPE-OSINT-Collector/1.0'
-        })
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.port_profile = port_profile if ports is None else "custom"
+        self.ports = list(ports) if ports is not None else PORT_PROFILES[port_profile]
+        self.port_timeout = port_timeout
+        self.port_concurrency = port_concurrency
+        self.port_scan_deadline = port_scan_deadline
+        self.cache = cache
+        self.whois_queue = whois_queue if whois_queue is not None else get_default_whois_queue()
+        self.http_probe_mode = http_probe_mode
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        
+        self.https_port = https_port
+        self.http_port = http_port
+        self.ca_bundle = ca_bundle
+        self.ssl_context = ssl.create_default_context(cafile=ca_bundle) if ca_bundle else None
         
-    def collect_vendor_intelligence(self, domain: str) -> Dict:
+        if dns_nameservers:
+            # Answers from custom nameservers must not leak into the shared cache
+            self.resolver = dns.asyncresolver.Resolver(configure=False)
+            self.resolver.nameservers = list(dns_nameservers)
+            self.resolver.port = dns_port
+            self.resolver.cache = dns.resolver.LRUCache()
+        else:
+            # Long-lived resolver backed by the shared answer cache
+            self.resolver = dns.asyncresolver.Resolver()
+            self.resolver.cache = DNS_ANSWER_CACHE
+        self.session = session if session is not None else get_shared_session()
+        self._contexts = {}
+        self._contexts_lock = threading.Lock()
+        
+    def collect_vendor_intelligence(self, domain: str, force_refresh: bool = False,
+                                    previous: Optional[Dict] = None,
+                                    freshness: Optional[Dict[str, float]] = None,
+                                    deadline: Optional[float] = None, profile: str = "full",
+                                    probes: Optional[List[str]] = None) -> Dict:
         """
         Collect comprehensive OSINT data for a vendor domain
         
         Args:
             domain: Vendor domain to analyze
+            force_refresh: Ignore cached and previous probe results and probe everything again
+            previous: Earlier result for the same domain whose fresh probes are reused
+            freshness: Maximum age in seconds per probe for reusing previous results,
+                merged over PROBE_TTLS
+            deadline: Overall time budget in seconds; probes still running when it
+                expires are abandoned and the result is marked partial
+            profile: Name of the PROBE_PROFILES entry selecting the probes to run
+            probes: Explicit probe names, overrides profile
             
         Returns:
             Dictionary containing all collected intelligence data
@@ -44,49 +370,275 @@ class OSINTCollector:
         # Normalize domain
         domain = self._normalize_domain(domain)
         
+        # Only the selected probes (and what they depend on) are run
+        selected = resolve_probe_selection(profile, probes)
+        profile = profile if probes is None else "custom"
+        probes = {name: types.MethodType(PROBE_REGISTRY[name].run, self) for name in selected}
+        
+        # Reuse still-fresh probe results from the previous snapshot, then from the cache
+        reused = {}
+        same_domain = bool(previous) and previous.get("domain") == domain
+        if not force_refresh:
+            if same_domain:
+                # A previous port scan only counts if it scanned the same port profile
+                reused.update({key: entry for key, entry in
+                               self._fresh_snapshot_probes(previous, list(probes), freshness).items()
+                               if key != "port_scan" or entry[0].get("port_profile") == self.port_profile != "custom"})
+            if self.cache is not None:
+                for key in probes:
+                    if key not in reused:
+                        cached = self.cache.get_entry(domain, key, self._cache_variant(key))
+                        if cached is not None:
+                            reused[key] = cached
+        
+        # Probes outside the profile keep whatever the previous snapshot had, however old
+        carried = {}
+        if same_domain:
+            others = [name for name in PROBE_REGISTRY if name not in probes]
+            carried = self._fresh_snapshot_probes(previous, others, dict.fromkeys(others, float("inf")))
+        
+        collection_timestamp = time.time()
+        started = time.perf_counter()
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        to_run = {key: probe for key, probe in probes.items() if key not in reused}
+        
+        # The SSL probe can only wait for the header probe's handshake if both run side by side
+        share_tls = self.concurrent and "ssl_info" in to_run and "http_headers" in to_run
+        context = CollectionContext(domain, self._resolve_addresses, share_tls=share_tls,
+                                    deadline_at=deadline_at)
+        context.results.update({key: value for key, (value, _) in reused.items()})
+        with self._contexts_lock:
+            self._contexts[domain] = context
+        try:
+            probe_results, probe_timings, incomplete = self._run_probes(
+                domain, to_run, deadline_at,
+                dependencies={key: PROBE_REGISTRY[key].depends_on for key in to_run}
+            )
+        finally:
+            with self._contexts_lock:
+                if self._contexts.get(domain) is context:
+                    del self._contexts[domain]
+        
+        # Failed probes are not cached so they get retried on the next request
+        if self.cache is not None:
+            for key, value in probe_results.items():
+                if "error" not in value:
+                    self.cache.put(domain, key, value, stored_at=collection_timestamp,
+                                   variant=self._cache_variant(key))
+        
+        reused.update(carried)
+        present = [name for name in PROBE_REGISTRY if name in probes or name in carried]
+        probe_collected_at = {}
+        for key in present:
+            probe_collected_at[key] = reused[key][1] if key in reused else collection_timestamp
+        
         # Collect all intelligence data
         results = {
             "domain": domain,
-            "collection_timestamp": time.time(),
-            "basic_info": self._get_basic_domain_info(domain),
-            "ssl_info": self._check_ssl_tls(domain),
-            "dns_info": self._check_dns_security(domain),
-            "http_headers": self._check_http_security_headers(domain),
-            "port_scan": self._basic_port_scan(domain),
-            "shodan_data": self._get_shodan_data(domain),
-            "dark_web_exposure": self._check_dark_web_exposure(domain),
+            "collection_timestamp": collection_timestamp,
+            "profile": profile,
+            **{key: reused[key][0] if key in reused else probe_results.get(key) for key in present},
+            "probe_timings": probe_timings,
+            "probe_collected_at": probe_collected_at,
+            "cached_probes": list(reused),
+            "refreshed_probes": list(probe_results),
+            "collection_duration": round(time.perf_counter() - started, 3),
             "scores": {}
         }
         
-        # Calculate scores
-        results["scores"] = self._calculate_scores(results)
+        # Scores are calculated from whatever finished before the deadline
+        if incomplete:
+            results["partial"] = True
+            results["incomplete_probes"] = incomplete
         
-        logger.info(f"Completed OSINT collection for {domain}")
+        # Calculate scores, keeping only those backed by every probe they draw on
+        scores = self._calculate_scores(results)
+        produced = backed_score_keys(present)
+        results["scores"] = {key: value for key, value in scores.items() if key in produced}
+        
+        logger.info(f"Completed OSINT collection for {domain} in {results['collection_duration']}s "
+                    f"({len(probe_results)} probes run, {len(reused)} reused)")
         return results
     
+    def refresh_vendor_intelligence(self, previous: Dict,
+                                    freshness: Optional[Dict[str, float]] = None,
+                                    deadline: Optional[float] = None, profile: str = "full") -> Dict:
+        """
+        Incrementally refresh an earlier OSINT snapshot
+        
+        Only probes whose results are older than their freshness policy (or
+        failed last time) are run again; the rest are carried over and the
+        scores are recalculated over the merged result.
+        
+        Args:
+            previous: Earlier result of collect_vendor_intelligence
+            freshness: Maximum age in seconds per probe, merged over PROBE_TTLS
+            deadline: Overall time budget in seconds
+            profile: Probes outside this PROBE_PROFILES entry are carried over as they are
+            
+        Returns:
+            Dictionary containing the merged intelligence data
+        """
+        return self.collect_vendor_intelligence(previous["domain"], previous=previous, freshness=freshness,
+                                                deadline=deadline, profile=profile)
+    
+    def _cache_variant(self, key: str) -> Optional[str]:
+        """Collector options a probe's result depends on, kept apart in the cache"""
+        if key != "port_scan":
+            return None
+        if self.port_profile != "custom":
+            return self.port_profile
+        return "custom:" + ",".join(map(str, sorted(set(self.ports))))
+    
+    def _fresh_snapshot_probes(self, previous: Dict, keys: List[str],
+                               freshness: Optional[Dict[str, float]]) -> Dict[str, Tuple[Dict, float]]:
+        """Probe results from a snapshot that are still within their freshness policy"""
+        max_ages = {**PROBE_TTLS, **(freshness or {})}
+        collected_at = previous.get("probe_collected_at") or {}
+        now = time.time()
+        
+        fresh = {}
+        for key in keys:
+            value = previous.get(key)
+            if not isinstance(value, dict) or "error" in value:
+                continue
+            
+            # Snapshots taken before per-probe timestamps existed share one timestamp
+            timestamp = collected_at.get(key, previous.get("collection_timestamp"))
+            if timestamp is not None and now - timestamp <= max_ages.get(key, DEFAULT_PROBE_TTL):
+                fresh[key] = (value, timestamp)
+        return fresh
+    
+    def _run_probes(self, domain: str, probes: Dict[str, Callable[[str], Dict]],
+                    deadline_at: Optional[float] = None,
+                    dependencies: Optional[Dict[str, Tuple[str, ...]]] = None) -> Tuple[Dict, Dict, List[str]]:
+        """
+        Run probes against a domain, concurrently when enabled
+        
+        Args:
+            domain: Normalized domain to probe
+            probes: Mapping of result key to probe method, dependencies before dependents
+            deadline_at: time.monotonic() value after which unfinished probes are abandoned
+            dependencies: Probe names each probe waits for; names not in probes count as done
+            
+        Returns:
+            Tuple of (results by key, elapsed seconds by key, keys of probes
+            that did not finish before the deadline), results in probe order
+        """
+        started = time.monotonic()
+        dependencies = dependencies or {}
+        context = self._context_for(domain)
+        outcomes = {}
+        
+        def finish(key: str, outcome: Tuple[Dict, float]) -> None:
+            outcomes[key] = outcome
+            context.results[key] = outcome[0]
+        
+        if not self.concurrent or len(probes) < 2:
+            for key, probe in probes.items():
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    break
+                finish(key, self._timed_probe(probe, domain, key))
+        else:
+            workers = max(1, min(self.max_workers, len(probes)))
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="osint-probe")
+            waiting = dict(probes)
+            running = {}
+            
+            def submit_ready() -> None:
+                for key in list(waiting):
+                    if all(dep in outcomes or dep not in probes for dep in dependencies.get(key, ())):
+                        running[executor.submit(self._timed_probe, waiting.pop(key), domain, key)] = key
+            
+            try:
+                submit_ready()
+                while running:
+                    timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for future in done:
+                        finish(running.pop(future), future.result())
+                    submit_ready()
+            finally:
+                # Probes still running are left to wind down on their own, bounded by their timeouts
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        incomplete = [key for key in probes if key not in outcomes]
+        if incomplete:
+            logger.warning(f"Collection deadline reached for {domain}, abandoned probes: {', '.join(incomplete)}")
+            elapsed = round(time.monotonic() - started, 3)
+            for key in incomplete:
+                outcomes[key] = ({"error": "Collection deadline exceeded", "timed_out": True}, elapsed)
+        
+        results = {key: outcomes[key][0] for key in probes}
+        timings = {key: outcomes[key][1] for key in probes}
+        return results, timings, incomplete
+    
+    def _timed_probe(self, probe: Callable[[str], Dict], domain: str,
+                     name: Optional[str] = None) -> Tuple[Dict, float]:
+        """Run a single probe, measure its wall time in seconds and record its metrics"""
+        start_byte_count()
+        started = time.perf_counter()
+        try:
+            result = probe(domain)
+        except Exception as e:
+            # Probes handle their own errors; this only guards against unexpected failures
+            logger.error(f"Probe {probe.__name__} failed for {domain}: {e}")
+            result = {"error": str(e)}
+        elapsed = time.perf_counter() - started
+        received_bytes = stop_byte_count()
+        
+        self.metrics.observe(name or probe.__name__, probe_outcome(result), elapsed, received_bytes)
+        return result, round(elapsed, 3)
+    
+    def _context_for(self, domain: str) -> CollectionContext:
+        """Context of the running collection, or a standalone one for direct probe calls"""
+        with self._contexts_lock:
+            context = self._contexts.get(domain)
+        return context if context is not None else CollectionContext(domain, self._resolve_addresses)
+    
+    def _resolve_addresses(self, domain: str, lifetime: Optional[float] = None) -> List[str]:
+        """
+        Resolve a domain's A and AAAA records through the cached resolver
+        
+        Args:
+            domain: Normalized domain
+            lifetime: Optional time limit for the DNS queries in seconds
+            
+        Returns:
+            Unique addresses, IPv4 first; empty when the domain does not resolve
+        """
+        answers = asyncio.run(self._resolve_dns_records([(domain, "A"), (domain, "AAAA")], lifetime))
+        addresses = [str(record) for answer in answers if not isinstance(answer, Exception)
+                     for record in answer]
+        
+        # Names only the system resolver knows about, e.g. from the hosts file. It
+        # takes no timeout, so it is skipped once the collection budget is spent
+        if not addresses and (lifetime is None or lifetime > 0):
+            try:
+                infos = socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM)
+                addresses = [info[4][0] for info in sorted(infos, key=lambda info: info[0] != socket.AF_INET)]
+            except socket.gaierror:
+                pass
+        
+        return list(dict.fromkeys(addresses))
+    
     def _normalize_domain(self, domain: str) -> str:
         """Normalize domain by removing protocol and path"""
-        if domain.startswith(('http://', 'https://')):
-            domain = urlparse(domain).netloc
-        return domain.lower().strip()
+        return normalize_domain(domain)
     
     def _get_basic_domain_info(self, domain: str) -> Dict:
         """Get basic domain information and WHOIS data"""
         try:
             logger.info(f"Collecting WHOIS data for {domain}")
-            w = whois.whois(domain)
             
-            return {
-                "registrar": w.registrar,
-                "creation_date": str(w.creation_date) if w.creation_date else None,
-                "expiration_date": str(w.expiration_date) if w.expiration_date else None,
-                "updated_date": str(w.updated_date) if w.updated_date else None,
-                "name_servers": w.name_servers if w.name_servers else [],
-                "status": w.status if w.status else [],
-                "emails": w.emails if w.emails else [],
-                "org": w.org if w.org else None,
-                "country": w.country if w.country else None
-            }
+            # Served from the persistent cache when possible, otherwise rate limited per TLD.
+            # The query runs on the WHOIS queue, so this probe stops waiting at the deadline
+            return self.whois_queue.lookup(domain, timeout=self._context_for(domain).remaining())
+        except FutureTimeoutError:
+            logger.warning(f"WHOIS lookup for {domain} did not finish before the collection deadline")
+            return {"error": "WHOIS lookup timed out", "timed_out": True}
         except Exception as e:
             logger.error(f"Error collecting WHOIS data for {domain}: {e}")
             return {"error": str(e)}
@@ -96,41 +648,21 @@ class OSINTCollector:
         try:
             logger.info(f"Checking SSL/TLS for {domain}")
             
-            # Create SSL context
-            context = ssl.create_default_context()
+            # Reuse the handshake the HTTPS header probe makes when it gets one. Only
+            # half the budget is spent waiting, so a server that completes the
+            # handshake but answers slowly still leaves time for a handshake here
+            context = self._context_for(domain)
+            context.tls_ready.wait(timeout=context.timeout(HTTP_TIMEOUT) / 2)
+            if context.tls_info is not None:
+                return dict(context.tls_info)
             
-            # Connect to domain on port 443
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    # Get cipher info
-                    cipher = ssock.cipher()
-                    
-                    # Check certificate details
-                    subject = dict(x[0] for x in cert['subject'])
-                    issuer = dict(x[0] for x in cert['issuer'])
-                    
-                    # Parse dates
-                    not_before = ssl.cert_time_to_seconds(cert['notBefore'])
-                    not_after = ssl.cert_time_to_seconds(cert['notAfter'])
-                    
-                    # Calculate days until expiration
-                    days_until_expiry = (not_after - time.time()) / (24 * 3600)
-                    
-                    return {
-                        "certificate_valid": True,
-                        "subject": subject,
-                        "issuer": issuer,
-                        "not_before": cert['notBefore'],
-                        "not_after": cert['notAfter'],
-                        "days_until_expiry": int(days_until_expiry),
-                        "cipher_suite": cipher[0] if cipher else None,
-                        "cipher_version": cipher[1] if cipher else None,
-                        "cipher_bits": cipher[2] if cipher else None,
-                        "protocol_version": ssock.version(),
-                        "san_domains": cert.get('subjectAltName', [])
-                    }
+            # Connect to the already resolved address, verifying against the domain
+            address = context.preferred_address() or domain
+            ssl_context = self.ssl_context or get_ssl_context()
+            with socket.create_connection((address, self.https_port), timeout=context.timeout(HTTP_TIMEOUT)) as sock:
+                with ssl_context.wrap_socket(sock, server_hostname=domain) as ssock:
+                    add_bytes(len(ssock.getpeercert(binary_form=True) or b""))
+                    return describe_tls_session(ssock)
                     
         except Exception as e:
             logger.error(f"Error checking SSL/TLS for {domain}: {e}")
@@ -156,64 +688,52 @@ class OSINTCollector:
                 "ns_records": []
             }
             
-            # Get A records
-            try:
-                a_records = dns.resolver.resolve(domain, 'A')
-                results["a_records"] = [str(record) for record in a_records]
-            except Exception as e:
-                logger.warning(f"Could not resolve A records for {domain}: {e}")
+            # Issue every lookup at once instead of waiting on each round trip
+            lookups = [
+                ("A", domain, "A"),
+                ("AAAA", domain, "AAAA"),
+                ("MX", domain, "MX"),
+                ("TXT", domain, "TXT"),
+                ("DMARC", f"_dmarc.{domain}", "TXT"),
+                ("CNAME", domain, "CNAME"),
+                ("NS", domain, "NS")
+            ]
+            answers = asyncio.run(self._resolve_dns_records([(name, rdtype) for _, name, rdtype in lookups],
+                                                            self._context_for(domain).remaining()))
             
-            # Get AAAA records
-            try:
-                aaaa_records = dns.resolver.resolve(domain, 'AAAA')
-                results["aaaa_records"] = [str(record) for record in aaaa_records]
-            except Exception as e:
-                logger.warning(f"Could not resolve AAAA records for {domain}: {e}")
+            records = {}
+            for (label, _, _), answer in zip(lookups, answers):
+                if isinstance(answer, Exception):
+                    logger.warning(f"Could not resolve {label} records for {domain}: {answer}")
+                else:
+                    records[label] = answer
             
-            # Get MX records
-            try:
-                mx_records = dns.resolver.resolve(domain, 'MX')
-                results["mx_records"] = [str(record.exchange) for record in mx_records]
-            except Exception as e:
-                logger.warning(f"Could not resolve MX records for {domain}: {e}")
+            if "A" in records:
+                results["a_records"] = [str(record) for record in records["A"]]
+            if "AAAA" in records:
+                results["aaaa_records"] = [str(record) for record in records["AAAA"]]
+            if "MX" in records:
+                results["mx_records"] = [str(record.exchange) for record in records["MX"]]
             
-            # Get TXT records
-            try:
-                txt_records = dns.resolver.resolve(domain, 'TXT')
-                results["txt_records"] = [str(record) for record in txt_records]
+            if "TXT" in records:
+                results["txt_records"] = [str(record) for record in records["TXT"]]
                 
                 # Check for SPF record
-                for record in txt_records:
+                for record in records["TXT"]:
                     if 'v=spf1' in str(record):
                         results["spf_record"] = str(record)
                         break
-            except Exception as e:
-                logger.warning(f"Could not resolve TXT records for {domain}: {e}")
             
             # Check DMARC record
-            try:
-                dmarc_domain = f"_dmarc.{domain}"
-                dmarc_records = dns.resolver.resolve(dmarc_domain, 'TXT')
-                for record in dmarc_records:
-                    if 'v=DMARC1' in str(record):
-                        results["dmarc_record"] = str(record)
-                        break
-            except Exception as e:
-                logger.warning(f"Could not resolve DMARC record for {domain}: {e}")
-            
-            # Get CNAME records
-            try:
-                cname_records = dns.resolver.resolve(domain, 'CNAME')
-                results["cname_records"] = [str(record) for record in cname_records]
-            except Exception as e:
-                logger.warning(f"Could not resolve CNAME records for {domain}: {e}")
+            for record in records.get("DMARC", []):
+                if 'v=DMARC1' in str(record):
+                    results["dmarc_record"] = str(record)
+                    break
             
-            # Get NS records
-            try:
-                ns_records = dns.resolver.resolve(domain, 'NS')
-                results["ns_records"] = [str(record) for record in ns_records]
-            except Exception as e:
-                logger.warning(f"Could not resolve NS records for {domain}: {e}")
+            if "CNAME" in records:
+                results["cname_records"] = [str(record) for record in records["CNAME"]]
+            if "NS" in records:
+                results["ns_records"] = [str(record) for record in records["NS"]]
             
             return results
             
@@ -221,17 +741,45 @@ class OSINTCollector:
             logger.error(f"Error checking DNS security for {domain}: {e}")
             return {"error": str(e)}
     
+    async def _resolve_dns_records(self, queries: List[Tuple[str, str]],
+                                   lifetime: Optional[float] = None) -> List:
+        """
+        Resolve DNS queries concurrently through the cached resolver
+        
+        Args:
+            queries: (name, record type) pairs
+            lifetime: Optional time limit per query in seconds, defaults to the resolver's
+            
+        Returns:
+            Answers in query order; failed lookups are returned as exceptions
+        """
+        if lifetime is not None:
+            lifetime = max(MIN_PROBE_TIMEOUT, lifetime)
+        return await asyncio.gather(
+            *(self.resolver.resolve(name, rdtype, lifetime=lifetime) for name, rdtype in queries),
+            return_exceptions=True
+        )
+    
     def _check_http_security_headers(self, domain: str) -> Dict:
         """Check HTTP security headers"""
         try:
             logger.info(f"Checking HTTP security headers for {domain}")
             
+            context = self._context_for(domain)
+            
             # Try HTTPS first, then HTTP
-            urls_to_try = [f"https://{domain}", f"http://{domain}"]
+            urls_to_try = [
+                f"https://{domain}" if self.https_port == 443 else f"https://{domain}:{self.https_port}",
+                f"http://{domain}" if self.http_port == 80 else f"http://{domain}:{self.http_port}"
+            ]
             
             for url in urls_to_try:
                 try:
-                    response = self.session.get(url, timeout=10, allow_redirects=True)
+                    try:
+                        response = self._fetch_headers(url, context)
+                    finally:
+                        # Without a usable handshake the SSL probe connects on its own
+                        context.publish_tls(None)
                     
                     headers = dict(response.headers)
                     
@@ -249,11 +797,20 @@ class OSINTCollector:
                         "x_powered_by": headers.get("X-Powered-By")
                     }
                     
+                    # Every hop was already fetched while following redirects
+                    redirect_chain = [
+                        {"url": hop.url, "status_code": hop.status_code, "location": hop.headers.get("Location")}
+                        for hop in response.history
+                    ]
+                    
                     return {
                         "url": url,
+                        "final_url": response.url,
                         "status_code": response.status_code,
+                        "probe_method": response.request.method,
+                        "redirect_chain": redirect_chain,
                         "security_headers": security_headers,
-                        "all_headers": headers
+                        "all_headers": {name: value[:MAX_HEADER_VALUE_LENGTH] for name, value in headers.items()}
                     }
                     
                 except requests.exceptions.RequestException as e:
@@ -266,44 +823,161 @@ class OSINTCollector:
             logger.error(f"Error checking HTTP headers for {domain}: {e}")
             return {"error": str(e)}
     
+    def _fetch_headers(self, url: str, context: Optional[CollectionContext] = None) -> requests.Response:
+        """
+        Fetch response headers for a URL, reading at most HTTP_DRAIN_LIMIT bytes of body
+        
+        Args:
+            url: URL to request, redirects are followed
+            context: Collection context supplying the resolved address and
+                receiving the TLS facts of the first HTTPS hop to the domain
+            
+        Returns:
+            Closed response carrying status, headers and redirect history
+        """
+        headers = {}
+        hooks = {'response': [self._count_header_bytes]}
+        if context is not None:
+            address = context.preferred_address()
+            if address and isinstance(self.session.get_adapter(url), PinnedAddressAdapter):
+                headers[PINNED_ADDRESS_HEADER] = f"{context.domain}={address}"
+            
+            def capture_tls(response, *args, **kwargs):
+                parsed = urlparse(response.url)
+                if parsed.scheme == 'https' and parsed.hostname == context.domain and not context.tls_ready.is_set():
+                    tls_session = response_tls_session(response)
+                    if tls_session is not None:
+                        context.publish_tls(tls_session)
+            
+            hooks['response'].append(capture_tls)
+        
+        if self.http_probe_mode == "head":
+            response = self.session.head(url, timeout=self._http_timeout(context), allow_redirects=True,
+                                         headers=headers, hooks=hooks, verify=self.ca_bundle or True)
+            response.close()
+            
+            # Some servers reject or mishandle HEAD; fall back to GET for those
+            if response.status_code < 400:
+                return response
+        
+        # Headers arrive before the body, so only a short body is read, to keep the connection
+        response = self.session.get(url, timeout=self._http_timeout(context), allow_redirects=True, stream=True,
+                                    headers=headers, hooks=hooks, verify=self.ca_bundle or True)
+        self._drain_and_close(response)
+        return response
+    
+    def _drain_and_close(self, response: requests.Response) -> None:
+        """Close a streamed response, returning its connection to the pool when the rest of the
+        body fits in HTTP_DRAIN_LIMIT and dropping the connection otherwise"""
+        drained = 0
+        length = response.headers.get('Content-Length', '')
+        if length.isdigit() and int(length) > HTTP_DRAIN_LIMIT:
+            response.close()
+            return
+        try:
+            for chunk in response.raw.stream(8192, decode_content=False):
+                drained += len(chunk)
+                if drained > HTTP_DRAIN_LIMIT:
+                    break
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            logger.debug(f"Could not drain response from {response.url}: {e}")
+        add_bytes(drained)
+        # A fully read body has already released its connection; close() drops an unfinished one
+        response.close()
+    
+    def _http_timeout(self, context: Optional[CollectionContext]) -> float:
+        """HTTP timeout capped by the remaining collection budget"""
+        return context.timeout(HTTP_TIMEOUT) if context is not None else HTTP_TIMEOUT
+    
+    def _count_header_bytes(self, response: requests.Response, *args, **kwargs) -> None:
+        """Response hook attributing a hop's status line and headers to the running probe"""
+        add_bytes(len(response.reason or "") + 15 +
+                  sum(len(name) + len(value) + 4 for name, value in response.headers.items()))
+    
     def _basic_port_scan(self, domain: str) -> Dict:
         """Perform basic port scanning"""
         try:
             logger.info(f"Performing port scan for {domain}")
             
-            # Common ports to check
-            common_ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3306, 3389, 5432, 8080, 8443]
-            
-            open_ports = []
-            
-            # Get IP address
-            try:
-                ip = socket.gethostbyname(domain)
-            except socket.gaierror:
+            # Scan the address the other probes connect to
+            context = self._context_for(domain)
+            ip = context.preferred_address()
+            if ip is None:
                 return {"error": f"Could not resolve IP for {domain}"}
             
-            # Scan ports
-            for port in common_ports:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(2)
-                    result = sock.connect_ex((ip, port))
-                    if result == 0:
-                        open_ports.append(port)
-                    sock.close()
-                except Exception as e:
-                    logger.warning(f"Error scanning port {port}: {e}")
+            # Scan all ports at once so a filtered host costs one timeout, not one per port
+            started = time.perf_counter()
+            open_ports, unscanned_ports = asyncio.run(
+                self._scan_ports_async(ip, self.ports, context.timeout(self.port_scan_deadline))
+            )
             
-            return {
+            results = {
                 "ip_address": ip,
                 "open_ports": open_ports,
-                "total_ports_scanned": len(common_ports)
+                "total_ports_scanned": len(self.ports) - len(unscanned_ports),
+                "port_profile": self.port_profile,
+                "scan_duration": round(time.perf_counter() - started, 3)
             }
             
+            if unscanned_ports:
+                logger.warning(f"Port scan deadline reached for {domain}, {len(unscanned_ports)} ports not scanned")
+                results["deadline_exceeded"] = True
+                results["unscanned_ports"] = unscanned_ports
+            
+            return results
+            
         except Exception as e:
             logger.error(f"Error performing port scan for {domain}: {e}")
             return {"error": str(e)}
     
+    async def _scan_ports_async(self, ip: str, ports: List[int],
+                                scan_deadline: Optional[float] = None) -> Tuple[List[int], List[int]]:
+        """
+        Probe TCP ports concurrently with a concurrency cap and an overall deadline
+        
+        Args:
+            ip: Address to scan
+            ports: Ports to probe
+            scan_deadline: Overall time limit in seconds, defaults to port_scan_deadline
+            
+        Returns:
+            Tuple of (sorted open ports, ports left unscanned at the deadline)
+        """
+        scan_deadline = scan_deadline if scan_deadline is not None else self.port_scan_deadline
+        port_timeout = min(self.port_timeout, scan_deadline)
+        semaphore = asyncio.Semaphore(self.port_concurrency)
+        
+        async def probe(port: int) -> Tuple[int, bool]:
+            async with semaphore:
+                try:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(ip, port), timeout=port_timeout
+                    )
+                except (OSError, asyncio.TimeoutError):
+                    return port, False
+                
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+                return port, True
+        
+        tasks = [asyncio.create_task(probe(port)) for port in ports]
+        if not tasks:
+            return [], []
+        
+        done, pending = await asyncio.wait(tasks, timeout=scan_deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        outcomes = dict(task.result() for task in done)
+        open_ports = sorted(port for port, is_open in outcomes.items() if is_open)
+        unscanned_ports = [port for port in ports if port not in outcomes]
+        return open_ports, unscanned_ports
+    
     def _get_shodan_data(self, domain: str) -> Dict:
         """Get Shodan data for domain (requires API key)"""
         if not self.shodan_api_key:
@@ -314,7 +988,8 @@ class OSINTCollector:
             
             # Get domain info
             url = f"https://api.shodan.io/dns/domain/{domain}?key={self.shodan_api_key}"
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=self._context_for(domain).timeout(HTTP_TIMEOUT))
+            add_bytes(len(response.content))
             
             if response.status_code == 200:
                 data = response.json()
@@ -471,19 +1146,243 @@ class OSINTCollector:
         
         return scores
 
-def collect_vendor_osint(domain: str, shodan_api_key: Optional[str] = None) -> Dict:
+# Relative cost of running a probe, cheapest first
+PROBE_COST_CLASSES = ("cheap", "moderate", "expensive")
+
+class ProbeSpec:
+    """Declaration of a probe the collector can run"""
+    
+    def __init__(self, name: str, run: Callable[[OSINTCollector, str], Dict], cost: str = "moderate",
+                 depends_on: Tuple[str, ...] = (), output_keys: Tuple[str, ...] = ()):
+        """
+        Args:
+            name: Result key the probe's output is stored under
+            run: Function called with the collector and the normalized domain
+            cost: One of PROBE_COST_CLASSES
+            depends_on: Probes whose results must be in the collection context first
+            output_keys: Scores calculated from this probe's result
+        """
+        if cost not in PROBE_COST_CLASSES:
+            raise ValueError(f"Unknown probe cost class: {cost}")
+        self.name = name
+        self.run = run
+        self.cost = cost
+        self.depends_on = tuple(depends_on)
+        self.output_keys = tuple(output_keys)
+
+# Registered probes in registration order, which is always a valid run order
+PROBE_REGISTRY: Dict[str, ProbeSpec] = {}
+
+def register_probe(spec: ProbeSpec) -> ProbeSpec:
+    """Add a probe to the registry; its dependencies must already be registered"""
+    missing = [name for name in spec.depends_on if name not in PROBE_REGISTRY]
+    if missing:
+        raise ValueError(f"Probe {spec.name} depends on unregistered probes: {', '.join(missing)}")
+    PROBE_REGISTRY[spec.name] = spec
+    return spec
+
+register_probe(ProbeSpec("basic_info", OSINTCollector._get_basic_domain_info, cost="expensive",
+                         output_keys=("reputation_score",)))
+register_probe(ProbeSpec("ssl_info", OSINTCollector._check_ssl_tls, cost="moderate",
+                         output_keys=("ssl_score",)))
+register_probe(ProbeSpec("dns_info", OSINTCollector._check_dns_security, cost="cheap",
+                         output_keys=("dns_email_score",)))
+register_probe(ProbeSpec("http_headers", OSINTCollector._check_http_security_headers, cost="moderate",
+                         output_keys=("http_headers_score",)))
+register_probe(ProbeSpec("port_scan", OSINTCollector._basic_port_scan, cost="expensive",
+                         output_keys=("open_ports_score",)))
+register_probe(ProbeSpec("shodan_data", OSINTCollector._get_shodan_data, cost="expensive"))
+register_probe(ProbeSpec("dark_web_exposure", OSINTCollector._check_dark_web_exposure, cost="cheap",
+                         output_keys=("reputation_score",)))
+
+def backed_score_keys(probe_names) -> set:
+    """
+    Score keys fully backed by the given probes
+    
+    A score drawing on several probes, like reputation_score (WHOIS age and
+    dark web exposure), is only backed when all of them are present;
+    computed from some of them it would not be comparable to a full score.
+    """
+    probe_names = set(probe_names)
+    contributors = {}
+    for spec in PROBE_REGISTRY.values():
+        for key in spec.output_keys:
+            contributors.setdefault(key, set()).add(spec.name)
+    return {key for key, names in contributors.items() if names <= probe_names}
+
+# Named probe selections; None selects every registered probe
+PROBE_PROFILES = {
+    # Intake: everything, including WHOIS, port scans and Shodan
+    "full": None,
+    # Monitoring: skips the rate limited and slow probes
+    "fast": ["ssl_info", "dns_info", "http_headers", "dark_web_exposure"],
+    # Email security posture only
+    "email-only": ["dns_info"]
+}
+
+def resolve_probe_selection(profile: str = "full", probes: Optional[List[str]] = None) -> List[str]:
+    """
+    Probe names to run for a profile or explicit list, including their dependencies
+    
+    Args:
+        profile: Name of a PROBE_PROFILES entry
+        probes: Explicit probe names, overrides profile
+        
+    Returns:
+        Probe names in registry order
+    """
+    if probes is None:
+        if profile not in PROBE_PROFILES:
+            raise ValueError(f"Unknown probe profile: {profile}")
+        probes = PROBE_PROFILES[profile] if PROBE_PROFILES[profile] is not None else list(PROBE_REGISTRY)
+    
+    unknown = [name for name in probes if name not in PROBE_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown probes: {', '.join(unknown)}")
+    
+    selected = set()
+    pending = list(probes)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(PROBE_REGISTRY[name].depends_on)
+    return [name for name in PROBE_REGISTRY if name in selected]
+
+def collect_vendor_osint(domain: str, shodan_api_key: Optional[str] = None,
+                         concurrent: bool = True, port_profile: str = "common",
+                         cache: Optional[OSINTResultCache] = None,
+                         force_refresh: bool = False,
+                         single_flight: Optional[SingleFlight] = None,
+                         deadline: Optional[float] = None, profile: str = "full",
+                         **collector_options) -> Dict:
     """
     Convenience function to collect OSINT data for a vendor domain
     
     Args:
         domain: Vendor domain to analyze
         shodan_api_key: Optional Shodan API key
+        concurrent: Run independent probes in parallel
+        port_profile: Name of the PORT_PROFILES entry to scan
+        cache: Optional probe result cache shared between calls
+        force_refresh: Ignore cached results and probe everything again
+        single_flight: Optional coalescer; concurrent calls for the same domain
+            and options then share one collection
+        deadline: Overall time budget in seconds, including any wait for a shared
+            collection; unfinished probes are marked partial
+        profile: Name of the PROBE_PROFILES entry selecting the probes to run
+        **collector_options: Extra keyword arguments for OSINTCollector
+        
+    Returns:
+        Dictionary containing OSINT data, per-probe timings and scores
+    """
+    deadline_at = time.monotonic() + deadline if deadline is not None else None
+    
+    def collect() -> Dict:
+        collector = OSINTCollector(shodan_api_key, concurrent=concurrent, port_profile=port_profile,
+                                   cache=cache, **collector_options)
+        # Time spent waiting on another caller's collection comes out of this caller's budget
+        remaining = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+        return collector.collect_vendor_intelligence(domain, force_refresh=force_refresh, deadline=remaining,
+                                                     profile=profile)
+    
+    if single_flight is None:
+        return collect()
+    
+    key = f"{normalize_domain(domain)}|{profile}|{port_profile}|{'refresh' if force_refresh else 'cached'}"
+    return single_flight.do(key, collect, timeout=deadline)
+
+def iter_bulk_vendor_osint(domains: List[str], max_workers: int = 4, domain_timeout: float = 60.0,
+                           concurrency_limit: Optional[threading.Semaphore] = None,
+                           **collect_kwargs) -> Iterator[Tuple[int, str, Dict]]:
+    """
+    Collect OSINT data for many domains on a bounded worker pool
+    
+    Each domain is isolated: failures and timeouts produce an error result for
+    that domain only. Only a small window of domains is in flight at a time, so
+    memory does not grow with the size of the batch.
+    
+    Args:
+        domains: Domains to analyze
+        max_workers: Number of domains collected at the same time by this call
+        domain_timeout: Seconds a single domain may run before it is reported as timed out
+        concurrency_limit: Optional semaphore shared between calls to cap collections process-wide
+        **collect_kwargs: Extra keyword arguments for collect_vendor_osint
+        
+    Yields:
+        (input index, domain, result) tuples in completion order
+    """
+    # Let each collection finish itself with partial results shortly before it would be abandoned.
+    # Every probe bounds its own I/O by what is left of this deadline, so the collection,
+    # its worker slot and its concurrency_limit permit are all released at the deadline
+    collect_kwargs.setdefault("deadline", max(1.0, domain_timeout * 0.9))
+    started_at = {}
+    
+    def run(index: int, domain: str) -> Dict:
+        if concurrency_limit is None:
+            started_at[index] = time.monotonic()
+            return collect_vendor_osint(domain, **collect_kwargs)
+        with concurrency_limit:
+            started_at[index] = time.monotonic()
+            return collect_vendor_osint(domain, **collect_kwargs)
+    
+    queue = iter(enumerate(domains))
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="osint-bulk")
+    
+    def fill() -> None:
+        while len(pending) < max(1, max_workers) * 2:
+            try:
+                index, domain = next(queue)
+            except StopIteration:
+                return
+            pending[executor.submit(run, index, domain)] = (index, domain)
+    
+    try:
+        fill()
+        while pending:
+            done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index, domain = pending.pop(future)
+                started_at.pop(index, None)
+                try:
+                    yield index, domain, future.result()
+                except Exception as e:
+                    logger.error(f"Bulk OSINT collection failed for {domain}: {e}")
+                    yield index, domain, {"error": str(e)}
+            
+            # Last resort for a collection stuck past its own deadline: report it so the
+            # batch moves on; its thread is only reclaimed once the stuck call returns
+            now = time.monotonic()
+            for future, (index, domain) in list(pending.items()):
+                started = started_at.get(index)
+                if started is not None and now - started > domain_timeout:
+                    del pending[future]
+                    started_at.pop(index, None)
+                    logger.warning(f"Bulk OSINT collection for {domain} timed out after {domain_timeout}s")
+                    yield index, domain, {"error": f"Collection timed out after {domain_timeout}s",
+                                          "timed_out": True}
+            
+            fill()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def collect_bulk_vendor_osint(domains: List[str], **kwargs) -> List[Tuple[str, Dict]]:
+    """
+    Collect OSINT data for many domains on a bounded worker pool
+    
+    Args:
+        domains: Domains to analyze
+        **kwargs: Keyword arguments for iter_bulk_vendor_osint
         
     Returns:
-        Dictionary containing OSINT data and scores
+        (domain, result) pairs in input order
     """
-    collector = OSINTCollector(shodan_api_key)
-    return collector.collect_vendor_intelligence(domain)
+    results = [None] * len(domains)
+    for index, domain, result in iter_bulk_vendor_osint(domains, **kwargs):
+        results[index] = (domain, result)
+    return results
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds for probe wall time, in seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Histogram bucket upper bounds for bytes received by a probe
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+PROBE_OUTCOMES = ("ok", "timeout", "error")
+
+_local = threading.local()
+
+def start_byte_count() -> None:
+    """Start counting bytes received by the probe running on this thread"""
+    _local.bytes = 0
+
+def add_bytes(count: int) -> None:
+    """Attribute bytes received to the probe running on this thread, if any"""
+    if getattr(_local, 'bytes', None) is not None:
+        _local.bytes += count
+
+def stop_byte_count() -> int:
+    """Stop counting and return the bytes received since start_byte_count"""
+    count = getattr(_local, 'bytes', None) or 0
+    _local.bytes = None
+    return count
+
+def probe_outcome(result) -> str:
+    """Classify a probe result as "ok", "timeout" or "error" """
+    if not isinstance(result, dict):
+        return "error"
+
+    if "error" in result:
+        message = str(result["error"]).lower()
+        if result.get("timed_out") or "timed out" in message or "timeout" in message:
+            return "timeout"
+        return "error"
+
+    # A port scan that hit its deadline returns partial results
+    if result.get("deadline_exceeded"):
+        return "timeout"
+    return "ok"
+
+class Histogram:
+    """Cumulative histogram in the Prometheus model, one series per label set"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+        series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        series["sum"] += value
+
+    def render(self, name: str, label_names: Sequence[str]) -> List[str]:
+        lines = []
+        for labels, series in sorted(self._series.items()):
+            base = _format_labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                lines.append(f'{name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{base}}} {_format_number(series['sum'])}")
+            lines.append(f"{name}_count{{{base}}} {cumulative}")
+        return lines
+
+class ProbeMetrics:
+    """Thread-safe per-probe latency, outcome and traffic metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes = {}
+        self._durations = Histogram(DURATION_BUCKETS)
+        self._bytes = Histogram(BYTES_BUCKETS)
+
+    def observe(self, probe: str, outcome: str, duration: float, received_bytes: int = 0) -> None:
+        """
+        Record one probe run
+
+        Args:
+            probe: Result key of the probe, e.g. "ssl_info"
+            outcome: One of PROBE_OUTCOMES
+            duration: Wall time in seconds
+            received_bytes: Bytes received from the network while probing
+        """
+        with self._lock:
+            key = (probe, outcome)
+            self._outcomes[key] = self._outcomes.get(key, 0) + 1
+            self._durations.observe(key, duration)
+            self._bytes.observe((probe,), received_bytes)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Run counts by probe and outcome"""
+        with self._lock:
+            counts = {}
+            for (probe, outcome), count in self._outcomes.items():
+                counts.setdefault(probe, dict.fromkeys(PROBE_OUTCOMES, 0))[outcome] = count
+            return counts
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                "# HELP osint_probe_runs_total OSINT probe runs by outcome.",
+                "# TYPE osint_probe_runs_total counter"
+            ]
+            for (probe, outcome), count in sorted(self._outcomes.items()):
+                lines.append(f'osint_probe_runs_total{{{_format_labels(("probe", "outcome"), (probe, outcome))}}} {count}')
+
+            lines += [
+                "# HELP osint_probe_duration_seconds Wall time of OSINT probe runs.",
+                "# TYPE osint_probe_duration_seconds histogram"
+            ]
+            lines += self._durations.render("osint_probe_duration_seconds", ("probe", "outcome"))
+
+            lines += [
+                "# HELP osint_probe_received_bytes Bytes received from the network per OSINT probe run.",
+                "# TYPE osint_probe_received_bytes histogram"
+            ]
+            lines += self._bytes.render("osint_probe_received_bytes", ("probe",))
+
+        return "\n".join(lines) + "\n"
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+def _format_number(value: float) -> str:
+    return repr(float(value))
+
+_default_metrics: Optional[ProbeMetrics] = None
+_default_metrics_lock = threading.Lock()
+
+def get_default_metrics() -> ProbeMetrics:
+    """Process-wide probe metrics shared by every collector"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = ProbeMetrics()
+        return _default_metrics
@@ -0,0 +1,191 @@
+import datetime
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Score keys produced by OSINTCollector._calculate_scores, in output order
+SCORE_NAMES = ("ssl_score", "dns_email_score", "http_headers_score", "open_ports_score", "reputation_score")
+
+# Security headers and the points each one is worth in the headers score
+HEADER_WEIGHTS = {
+    "strict_transport_security": 20,
+    "content_security_policy": 20,
+    "x_frame_options": 15,
+    "x_content_type_options": 15,
+    "x_xss_protection": 15,
+    "referrer_policy": 15
+}
+
+RISKY_PORTS = (21, 23, 25, 110, 143, 3306, 3389, 5432)
+EXPECTED_PORTS = (80, 443, 993, 995)
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def _section(data: Dict, key: str) -> Dict:
+    value = data.get(key)
+    return value if isinstance(value, dict) else {}
+
+def creation_age_days(creation_date, now: datetime.datetime) -> Optional[int]:
+    """
+    Whole days since a WHOIS creation date, parsed the way the scalar scorer does
+
+    Args:
+        creation_date: basic_info["creation_date"] as stored, a string, datetime or list of them
+        now: Reference time
+
+    Returns:
+        Age in days, or None when the value cannot be parsed
+    """
+    if isinstance(creation_date, list):
+        if not creation_date:
+            return None
+        creation_date = creation_date[0]
+    if isinstance(creation_date, datetime.datetime):
+        try:
+            return (now - creation_date).days
+        except TypeError:
+            return None
+    if not isinstance(creation_date, str):
+        return None
+
+    parts = creation_date.split()
+    if not parts:
+        return None
+    try:
+        # fromisoformat is much faster and agrees with strptime on zero-padded dates
+        if _ISO_DATE.fullmatch(parts[0]):
+            ordinal = datetime.date.fromisoformat(parts[0]).toordinal()
+        else:
+            ordinal = datetime.datetime.strptime(parts[0], "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+    # The parsed date is midnight, so the elapsed whole days are the difference in day numbers
+    return now.toordinal() - ordinal
+
+def extract_features(snapshots: Iterable[Dict], now: Optional[datetime.datetime] = None) -> Dict[str, np.ndarray]:
+    """
+    Turn OSINT snapshots into the columnar features the scores are computed from
+
+    Args:
+        snapshots: Results of OSINTCollector.collect_vendor_intelligence
+        now: Reference time for domain age, defaults to the current local time
+
+    Returns:
+        Mapping of feature name to a column with one entry per snapshot; open
+        ports are flattened into "ports" with their snapshot row in "port_rows"
+    """
+    cert_valid, modern_cipher, ecdhe_cipher, expiry_days = [], [], [], []
+    spf, dmarc, mx, a_records = [], [], [], []
+    headers = {name: [] for name in HEADER_WEIGHTS}
+    ports, port_rows = [], []
+    creation, exposed = [], []
+    now = now or datetime.datetime.now()
+
+    for row, data in enumerate(snapshots):
+        ssl_info = _section(data, "ssl_info")
+        cert_valid.append(bool(ssl_info.get("certificate_valid")))
+        cipher = ssl_info.get("cipher_suite") or ""
+        modern_cipher.append("TLS_AES" in cipher or "TLS_CHACHA20" in cipher)
+        ecdhe_cipher.append("TLS_ECDHE" in cipher)
+        expiry_days.append(ssl_info.get("days_until_expiry") or 0)
+
+        dns_info = _section(data, "dns_info")
+        spf.append(bool(dns_info.get("spf_record")))
+        dmarc.append(bool(dns_info.get("dmarc_record")))
+        mx.append(bool(dns_info.get("mx_records")))
+        a_records.append(bool(dns_info.get("a_records")))
+
+        security_headers = _section(data, "http_headers").get("security_headers") or {}
+        for name, column in headers.items():
+            column.append(bool(security_headers.get(name)))
+
+        open_ports = _section(data, "port_scan").get("open_ports") or []
+        ports.extend(open_ports)
+        port_rows.extend([row] * len(open_ports))
+
+        basic_info = _section(data, "basic_info")
+        age = creation_age_days(basic_info["creation_date"], now) if basic_info.get("creation_date") else None
+        creation.append(np.nan if age is None else age)
+
+        exposed.append(bool(_section(data, "dark_web_exposure").get("exposed")))
+
+    features = {
+        "cert_valid": np.array(cert_valid, dtype=bool),
+        "modern_cipher": np.array(modern_cipher, dtype=bool),
+        "ecdhe_cipher": np.array(ecdhe_cipher, dtype=bool),
+        "expiry_days": np.array(expiry_days, dtype=float),
+        "spf": np.array(spf, dtype=bool),
+        "dmarc": np.array(dmarc, dtype=bool),
+        "mx": np.array(mx, dtype=bool),
+        "a_records": np.array(a_records, dtype=bool),
+        "ports": np.array(ports, dtype=np.int64),
+        "port_rows": np.array(port_rows, dtype=np.int64),
+        "creation_age_days": np.array(creation, dtype=float),
+        "dark_web_exposed": np.array(exposed, dtype=bool)
+    }
+    for name, column in headers.items():
+        features[f"header_{name}"] = np.array(column, dtype=bool)
+    return features
+
+def score_features(features: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute every score column from extracted features in one vectorized pass
+
+    Args:
+        features: Output of extract_features
+
+    Returns:
+        Mapping of score name to an integer column
+    """
+    rows = len(features["cert_valid"])
+
+    # SSL: 80 for a valid certificate, cipher bonus, expiry penalty, clamped to 0-100
+    ssl_score = 80 + np.where(features["modern_cipher"], 10, np.where(features["ecdhe_cipher"], 5, 0))
+    expiry = features["expiry_days"]
+    ssl_score = ssl_score - np.where(expiry < 30, 20, np.where(expiry < 90, 10, 0))
+    ssl_score = np.clip(np.where(features["cert_valid"], ssl_score, 0), 0, 100)
+
+    dns_score = (30 * features["spf"] + 40 * features["dmarc"] +
+                 20 * features["mx"] + 10 * features["a_records"])
+
+    headers_score = np.zeros(rows, dtype=np.int64)
+    for name, weight in HEADER_WEIGHTS.items():
+        headers_score += weight * features[f"header_{name}"]
+
+    # Every open port costs points, risky services more than unexpected ones
+    ports, port_rows = features["ports"], features["port_rows"]
+    penalties = np.where(np.isin(ports, RISKY_PORTS), 15, np.where(np.isin(ports, EXPECTED_PORTS), 0, 5))
+    ports_score = np.maximum(0, 100 - np.bincount(port_rows, weights=penalties, minlength=rows).astype(np.int64))
+
+    # Reputation: domain age bonus and dark web penalty around a base of 50
+    with np.errstate(invalid="ignore"):
+        age_years = features["creation_age_days"] / 365
+        age_bonus = np.where(age_years > 5, 20, np.where(age_years > 2, 10, 0))
+    reputation_score = np.clip(50 + age_bonus - 30 * features["dark_web_exposed"], 0, 100)
+
+    return {
+        "ssl_score": ssl_score.astype(np.int64),
+        "dns_email_score": dns_score.astype(np.int64),
+        "http_headers_score": headers_score,
+        "open_ports_score": ports_score,
+        "reputation_score": reputation_score.astype(np.int64)
+    }
+
+def batch_calculate_scores(snapshots: List[Dict], now: Optional[datetime.datetime] = None) -> List[Dict]:
+    """
+    Score many OSINT snapshots at once
+
+    Gives the same scores as OSINTCollector._calculate_scores for each
+    snapshot, but computes them column-wise with NumPy.
+
+    Args:
+        snapshots: Results of OSINTCollector.collect_vendor_intelligence
+        now: Reference time for domain age, defaults to the current local time
+
+    Returns:
+        One scores dict per snapshot, in input order
+    """
+    columns = score_features(extract_features(snapshots, now))
+    return [dict(zip(SCORE_NAMES, values)) for values in zip(*(columns[name].tolist() for name in SCORE_NAMES))]
@@ -0,0 +1,208 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only coalesce within the process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Longest a caller without a deadline waits for another collection before running its own
+DEFAULT_WAIT_TIMEOUT = 120.0
+
+# Age in seconds after which a shared result file (and an idle lock file) is
+# deleted; waiters read a result as soon as the owner releases the lock, so
+# this only needs to outlast that
+DEFAULT_RESULT_TTL = 600.0
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution
+
+    Threads of one process share the owner's result through a Future. With a
+    lock directory, workers of different processes additionally serialize on
+    an flock()-ed lock file per key and pick up the result the owner wrote
+    next to it, so simultaneous requests trigger one collection in total.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None, wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+                 poll_interval: float = 0.1, result_ttl: float = DEFAULT_RESULT_TTL):
+        """
+        Args:
+            lock_dir: Directory shared by the worker processes; None coalesces in-process only
+            wait_timeout: Seconds to wait for another thread or process before running anyway,
+                for callers that pass no timeout of their own
+            poll_interval: Seconds between attempts to take another process's lock
+            result_ttl: Seconds a shared result or idle lock file is kept in lock_dir
+        """
+        self.lock_dir = lock_dir if fcntl is not None else None
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def do(self, key: str, fn: Callable[[], Dict], timeout: Optional[float] = None) -> Dict:
+        """
+        Run fn for key, or wait for the run already in progress
+
+        A caller that waits longer than its timeout for another thread or
+        process stops waiting and runs fn itself.
+
+        Args:
+            key: Deduplication key, e.g. a normalized domain
+            fn: Function producing a JSON-serializable result
+            timeout: Seconds this caller may wait, e.g. what is left of its deadline;
+                defaults to wait_timeout
+
+        Returns:
+            The result of the shared run; callers that waited get their own copy
+        """
+        timeout = self.wait_timeout if timeout is None else max(0.0, timeout)
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            logger.info(f"Joining in-flight collection for {key}")
+            try:
+                return copy.deepcopy(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                logger.warning(f"Timed out waiting for the in-flight collection of {key}")
+                return fn()
+
+        try:
+            result = self._run_exclusive(key, fn, timeout)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _run_exclusive(self, key: str, fn: Callable[[], Dict], timeout: float) -> Dict:
+        """Run fn while holding the key's cross-process lock, reusing a result produced meanwhile"""
+        if self.lock_dir is None:
+            return fn()
+
+        name = hashlib.sha256(key.encode()).hexdigest()
+        lock_path = os.path.join(self.lock_dir, f"{name}.lock")
+        result_path = os.path.join(self.lock_dir, f"{name}.json")
+        arrived = time.time()
+
+        with open(lock_path, 'a') as lock_file:
+            acquired, waited = self._acquire(lock_file, timeout)
+            if not acquired:
+                logger.warning(f"Timed out waiting for another worker's collection of {key}")
+                return fn()
+
+            try:
+                # Another worker held the lock; its result is ours if it finished after we arrived
+                if waited:
+                    shared = self._read_result(result_path, arrived)
+                    if shared is not None:
+                        logger.info(f"Reusing another worker's collection for {key}")
+                        return shared
+
+                result = fn()
+                self._write_result(result_path, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                self._prune_results()
+
+    def _acquire(self, lock_file, timeout: float) -> Tuple[bool, bool]:
+        """Take an exclusive lock within timeout seconds, returning (acquired, had to wait)"""
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True, waited
+            except BlockingIOError:
+                waited = True
+                if time.monotonic() >= deadline:
+                    return False, waited
+                time.sleep(self.poll_interval)
+
+    def _read_result(self, path: str, not_before: float) -> Optional[Dict]:
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return stored["result"] if stored.get("finished_at", 0) >= not_before else None
+
+    def _prune_results(self) -> None:
+        """Delete result and idle lock files older than result_ttl, at most once per result_ttl per instance"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + self.result_ttl
+
+        expired_before = time.time() - self.result_ttl
+        try:
+            entries = list(os.scandir(self.lock_dir))
+        except OSError as e:
+            logger.warning(f"Could not prune shared collection results: {e}")
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime >= expired_before:
+                    continue
+                if entry.name.endswith(('.json', '.tmp')):
+                    os.unlink(entry.path)
+                elif entry.name.endswith('.lock'):
+                    self._unlink_idle_lock(entry.path)
+            except OSError:
+                pass
+
+    def _unlink_idle_lock(self, path: str) -> None:
+        """Delete a lock file nobody holds"""
+        # A process that opened the file just before the unlink locks the old
+        # inode while later arrivals lock a new one; at worst that collection
+        # runs twice, which is what happens without coalescing anyway
+        with open(path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            try:
+                os.unlink(path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_result(self, path: str, result: Dict) -> None:
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.lock_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"finished_at": time.time(), "result": result}, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not share collection result: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+def default_lock_dir() -> str:
+    """Lock directory from OSINT_LOCK_DIR, defaulting to one under the temp directory"""
+    return os.getenv('OSINT_LOCK_DIR', os.path.join(tempfile.gettempdir(), 'scope_osint_locks'))
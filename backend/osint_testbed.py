@@ -0,0 +1,372 @@
+"""
+Local stand-in network for exercising the OSINT collector offline
+
+Runs a stub DNS server, TLS and plain HTTP servers with per-domain headers
+and delays, TCP listeners on selected ports and a fake WHOIS source, all on
+127.0.0.1. Every fixture domain resolves to 127.0.0.1 through the stub DNS
+server, so collections never leave the machine:
+
+    with OSINTTestbed() as testbed:
+        testbed.add_domain("vendor.scope.test", headers={"X-Frame-Options": "DENY"})
+        collector = OSINTCollector(**testbed.collector_options())
+        result = collector.collect_vendor_intelligence("vendor.scope.test")
+"""
+
+import http.server
+import logging
+import os
+import selectors
+import shutil
+import socket
+import socketserver
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.rrset
+
+from whois_cache import WhoisLookupQueue
+
+logger = logging.getLogger(__name__)
+
+# Parent zone of generated fixture domains; the test certificate covers *.TESTBED_ZONE
+TESTBED_ZONE = "scope.test"
+
+TESTBED_ADDRESS = "127.0.0.1"
+
+# Headers of a well configured site, used for fixtures without explicit headers
+DEFAULT_HEADERS = {
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": "default-src 'self'",
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "Referrer-Policy": "no-referrer",
+    "Server": "scope-testbed"
+}
+
+class FixtureDomain:
+    """What the testbed serves for one domain"""
+
+    def __init__(self, name: str, headers: Optional[Dict[str, str]] = None, http_delay: float = 0.0,
+                 dns_delay: float = 0.0, whois_delay: float = 0.0, status_code: int = 200,
+                 txt_records: Optional[List[str]] = None, mx_records: Optional[List[str]] = None,
+                 dmarc_record: Optional[str] = "v=DMARC1; p=reject",
+                 creation_date: Optional[str] = "2010-06-01 00:00:00"):
+        """
+        Args:
+            name: Fully qualified domain name
+            headers: Response headers of the HTTP and HTTPS servers, DEFAULT_HEADERS when None
+            http_delay: Seconds the web servers wait before answering
+            dns_delay: Seconds the DNS server waits before answering
+            whois_delay: Seconds the WHOIS lookup takes
+            status_code: HTTP status returned for every request
+            txt_records: TXT records, an SPF record by default
+            mx_records: Mail exchanger host names, one under the domain by default
+            dmarc_record: TXT record at _dmarc.<name>, None for no DMARC
+            creation_date: WHOIS creation date
+        """
+        self.name = name.lower().rstrip('.')
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.http_delay = http_delay
+        self.dns_delay = dns_delay
+        self.whois_delay = whois_delay
+        self.status_code = status_code
+        self.txt_records = txt_records if txt_records is not None else ["v=spf1 -all"]
+        self.mx_records = mx_records if mx_records is not None else [f"mail.{self.name}"]
+        self.dmarc_record = dmarc_record
+        self.creation_date = creation_date
+
+class _DNSHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+        response = self.server.testbed._answer_dns(query)
+        sock.sendto(response.to_wire(), self.client_address)
+
+class _DNSServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class _WebHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, with_body: bool):
+        host = (self.headers.get("Host") or "").rsplit(":", 1)[0].lower()
+        fixture = self.server.testbed.domains.get(host)
+        if fixture is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if fixture.http_delay:
+            time.sleep(fixture.http_delay)
+
+        body = b"<html><body>scope testbed</body></html>"
+        self.send_response(fixture.status_code)
+        for name, value in fixture.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(with_body=False)
+
+    def do_GET(self):
+        self._respond(with_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+class _WebServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, testbed, ssl_context: Optional[ssl.SSLContext] = None):
+        self.testbed = testbed
+        self.ssl_context = ssl_context
+        super().__init__(address, _WebHandler)
+
+    def finish_request(self, request, client_address):
+        # Handshake on the connection's own thread so one slow client cannot stall the accept loop
+        if self.ssl_context is not None:
+            request = self.ssl_context.wrap_socket(request, server_side=True)
+        super().finish_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Probes routinely drop connections right after the headers
+        pass
+
+class OSINTTestbed:
+    """Deterministic local network serving fixture domains to the OSINT collector"""
+
+    def __init__(self, open_ports: int = 3, closed_ports: int = 2, certificate_days: int = 365):
+        """
+        Args:
+            open_ports: Number of TCP ports with a listener, reported open by the port scan
+            closed_ports: Number of extra ports without a listener, reported closed
+            certificate_days: Validity of the generated server certificate
+        """
+        self.certificate_days = certificate_days
+        self.domains = {}
+        self.open_port_count = open_ports
+        self.closed_port_count = closed_ports
+        self.open_ports = []
+        self.closed_ports = []
+        self._servers = []
+        self._listeners = []
+        self._selector = None
+        self._stopping = threading.Event()
+        self._workdir = None
+        self.ca_bundle = None
+        self.dns_port = None
+        self.https_port = None
+        self.http_port = None
+
+    def add_domain(self, name: str, **options) -> FixtureDomain:
+        """Serve a domain; options are FixtureDomain keyword arguments
+
+        Domains outside TESTBED_ZONE only get a valid certificate when they
+        are added before start().
+        """
+        fixture = FixtureDomain(name, **options)
+        self.domains[fixture.name] = fixture
+        return fixture
+
+    def add_domains(self, count: int, **options) -> List[str]:
+        """Serve count generated domains under TESTBED_ZONE sharing the same options"""
+        names = [f"vendor{index:05d}.{TESTBED_ZONE}" for index in range(len(self.domains), len(self.domains) + count)]
+        for name in names:
+            self.add_domain(name, **options)
+        return names
+
+    def collector_options(self) -> Dict:
+        """Keyword arguments that point OSINTCollector at this testbed"""
+        return {
+            "dns_nameservers": [TESTBED_ADDRESS],
+            "dns_port": self.dns_port,
+            "https_port": self.https_port,
+            "http_port": self.http_port,
+            "ca_bundle": self.ca_bundle,
+            "ports": self.open_ports + self.closed_ports,
+            "whois_queue": WhoisLookupQueue(cache=None, default_interval=0.0, fetch=self.whois)
+        }
+
+    def whois(self, domain: str) -> Dict:
+        """Fake WHOIS record in the shape of whois_cache.fetch_whois_record"""
+        fixture = self.domains.get(domain)
+        if fixture is None:
+            raise LookupError(f"No WHOIS record for {domain}")
+        if fixture.whois_delay:
+            time.sleep(fixture.whois_delay)
+        return {
+            "registrar": "Testbed Registrar",
+            "creation_date": fixture.creation_date,
+            "expiration_date": "2035-06-01 00:00:00",
+            "updated_date": None,
+            "name_servers": [f"ns1.{TESTBED_ZONE}"],
+            "status": ["clientTransferProhibited"],
+            "emails": [f"hostmaster@{domain}"],
+            "org": "Testbed Vendor",
+            "country": "US"
+        }
+
+    def start(self) -> "OSINTTestbed":
+        """Generate certificates and start every server on an ephemeral port"""
+        self._workdir = tempfile.mkdtemp(prefix="scope-testbed-")
+        server_context = self._create_certificates()
+
+        dns_server = _DNSServer((TESTBED_ADDRESS, 0), _DNSHandler)
+        dns_server.testbed = self
+        https_server = _WebServer((TESTBED_ADDRESS, 0), self, ssl_context=server_context)
+        http_server = _WebServer((TESTBED_ADDRESS, 0), self)
+        self._servers = [dns_server, https_server, http_server]
+        self.dns_port = dns_server.server_address[1]
+        self.https_port = https_server.server_address[1]
+        self.http_port = http_server.server_address[1]
+
+        for server in self._servers:
+            threading.Thread(target=server.serve_forever, name="osint-testbed", daemon=True).start()
+
+        self._start_port_listeners()
+        logger.info(f"OSINT testbed up: dns={self.dns_port} https={self.https_port} http={self.http_port} "
+                    f"open ports={self.open_ports}")
+        return self
+
+    def stop(self) -> None:
+        """Shut every server down and remove the generated certificates"""
+        self._stopping.set()
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for listener in self._listeners:
+            listener.close()
+        if self._selector is not None:
+            self._selector.close()
+        if self._workdir:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def __enter__(self) -> "OSINTTestbed":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _answer_dns(self, query: dns.message.Message) -> dns.message.Message:
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        if not query.question:
+            response.set_rcode(dns.rcode.FORMERR)
+            return response
+
+        question = query.question[0]
+        name = question.name.to_text(omit_final_dot=True).lower()
+        dmarc = name.startswith("_dmarc.")
+        fixture = self.domains.get(name[len("_dmarc."):] if dmarc else name)
+        if fixture is None:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            return response
+
+        if fixture.dns_delay:
+            time.sleep(fixture.dns_delay)
+
+        values = []
+        if dmarc:
+            if question.rdtype == dns.rdatatype.TXT and fixture.dmarc_record:
+                values = [f'"{fixture.dmarc_record}"']
+        elif question.rdtype == dns.rdatatype.A:
+            values = [TESTBED_ADDRESS]
+        elif question.rdtype == dns.rdatatype.MX:
+            values = [f"{10 * (index + 1)} {host}." for index, host in enumerate(fixture.mx_records)]
+        elif question.rdtype == dns.rdatatype.TXT:
+            values = [f'"{record}"' for record in fixture.txt_records]
+        elif question.rdtype == dns.rdatatype.NS:
+            values = [f"ns1.{TESTBED_ZONE}."]
+
+        if values:
+            response.answer.append(dns.rrset.from_text_list(question.name, 300, dns.rdataclass.IN,
+                                                            question.rdtype, values))
+        return response
+
+    def _create_certificates(self) -> ssl.SSLContext:
+        """Create a throwaway CA and a server certificate for the fixture domains with openssl"""
+        ca_key = os.path.join(self._workdir, "ca.key")
+        ca_cert = os.path.join(self._workdir, "ca.pem")
+        key = os.path.join(self._workdir, "server.key")
+        csr = os.path.join(self._workdir, "server.csr")
+        cert = os.path.join(self._workdir, "server.pem")
+        extensions = os.path.join(self._workdir, "server.ext")
+
+        # Domains outside the zone need their own subject alternative name
+        names = [TESTBED_ZONE, f"*.{TESTBED_ZONE}"] + [
+            name for name in self.domains
+            if not name.endswith(f".{TESTBED_ZONE}") or name.count(".") > TESTBED_ZONE.count(".") + 1
+        ]
+        with open(extensions, "w") as f:
+            f.write("basicConstraints=CA:FALSE\n")
+            f.write("keyUsage=digitalSignature,keyEncipherment\n")
+            f.write("extendedKeyUsage=serverAuth\n")
+            f.write("subjectAltName=" + ",".join(f"DNS:{name}" for name in names) + "\n")
+
+        def openssl(*args):
+            subprocess.run(["openssl", *args], check=True, capture_output=True)
+
+        days = str(self.certificate_days)
+        openssl("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", days, "-subj", "/CN=SCOPE Testbed CA",
+                "-keyout", ca_key, "-out", ca_cert,
+                "-addext", "basicConstraints=critical,CA:TRUE", "-addext", "keyUsage=critical,keyCertSign,cRLSign")
+        openssl("req", "-newkey", "rsa:2048", "-nodes", "-subj", f"/CN={TESTBED_ZONE}", "-keyout", key, "-out", csr)
+        openssl("x509", "-req", "-in", csr, "-CA", ca_cert, "-CAkey", ca_key, "-CAcreateserial",
+                "-days", days, "-extfile", extensions, "-out", cert)
+
+        self.ca_bundle = ca_cert
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        return context
+
+    def _start_port_listeners(self) -> None:
+        """Listen on the open ports and reserve closed ones, accepting and dropping connections"""
+        self._selector = selectors.DefaultSelector()
+        for _ in range(self.open_port_count):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.bind((TESTBED_ADDRESS, 0))
+            listener.listen(1024)
+            listener.setblocking(False)
+            self._selector.register(listener, selectors.EVENT_READ)
+            self._listeners.append(listener)
+            self.open_ports.append(listener.getsockname()[1])
+
+        # Bound but never listening, so connects are refused like a closed port
+        for _ in range(self.closed_port_count):
+            reserved = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            reserved.bind((TESTBED_ADDRESS, 0))
+            self._listeners.append(reserved)
+            self.closed_ports.append(reserved.getsockname()[1])
+
+        threading.Thread(target=self._accept_loop, name="osint-testbed-ports", daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                events = self._selector.select(timeout=0.2)
+            except (OSError, ValueError):
+                return
+            for key, _ in events:
+                try:
+                    connection, _ = key.fileobj.accept()
+                    connection.close()
+                except OSError:
+                    pass
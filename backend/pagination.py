@@ -0,0 +1,121 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text, tuple_
+
+class InvalidCursorError(ValueError):
+    """A pagination cursor that was not issued by this API"""
+
+def encode_cursor(created_at: datetime, row_id: int, direction: str) -> str:
+    """Opaque token pointing just past a row, for paging in direction "next" or "prev" """
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str):
+    """(created_at, id, direction) from a token made by encode_cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(payload["c"]), int(payload["i"]), direction
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {token}") from e
+
+class KeysetPage:
+    """One page of a list ordered newest first by (created_at, id)"""
+
+    def __init__(self, items: List[Any], per_page: int, next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def to_dict(self) -> Dict:
+        return {
+            "mode": "cursor",
+            "per_page": self.per_page,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+            "has_next": self.next_cursor is not None,
+            "has_prev": self.prev_cursor is not None
+        }
+
+def keyset_query(query, model, cursor: Optional[str] = None):
+    """
+    Restrict and order a list query to the rows after (or before) a cursor
+
+    Args:
+        query: Filtered Flask-SQLAlchemy query over model; its ordering is replaced
+        model: Model with created_at and id columns
+        cursor: Token from encode_cursor; None starts at the newest row
+
+    Returns:
+        Tuple of (query, direction); "prev" queries are ordered oldest first
+    """
+    key = tuple_(model.created_at, model.id)
+    query = query.order_by(None)
+    if cursor is None:
+        return query.order_by(model.created_at.desc(), model.id.desc()), "next"
+
+    created_at, row_id, direction = decode_cursor(cursor)
+    if direction == "next":
+        query = query.filter(key < tuple_(created_at, row_id)).order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.filter(key > tuple_(created_at, row_id)).order_by(model.created_at.asc(), model.id.asc())
+    return query, direction
+
+def keyset_paginate(query, model, cursor: Optional[str] = None, per_page: int = 10) -> KeysetPage:
+    """
+    Fetch a page after (or before) a cursor instead of at an OFFSET
+
+    The page is located by an index range on (created_at, id), so page
+    10,000 costs the same as page 1.
+
+    Args:
+        query: Filtered Flask-SQLAlchemy query over model; its ordering is replaced
+        model: Model with created_at and id columns
+        cursor: Token from a previous page's next_cursor or prev_cursor; None for the first page
+        per_page: Page size
+
+    Returns:
+        The page, with cursors for the neighbouring pages where they exist
+    """
+    per_page = max(1, per_page)
+    query, direction = keyset_query(query, model, cursor)
+
+    # One extra row tells whether another page follows in this direction
+    rows = query.limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+
+    has_next = more if direction == "next" else cursor is not None
+    has_prev = cursor is not None if direction == "next" else more
+    return KeysetPage(
+        rows,
+        per_page,
+        next_cursor=encode_cursor(rows[-1].created_at, rows[-1].id, "next") if rows and has_next else None,
+        prev_cursor=encode_cursor(rows[0].created_at, rows[0].id, "prev") if rows and has_prev else None
+    )
+
+def approximate_count(query) -> int:
+    """
+    Row count of a query, estimated by the planner on PostgreSQL
+
+    Other databases get an exact COUNT(*).
+    """
+    query = query.order_by(None)
+    session = query.session
+    if session.get_bind().dialect.name != "postgresql":
+        return query.count()
+
+    statement = query.statement.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
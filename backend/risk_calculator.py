@@ -0,0 +1,272 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Risk Scoring Algorithm
+class RiskCalculator:
+    @staticmethod
+    def calculate_network_risk(security_tools, gaps):
+        base_score = 50
+        tool_bonus = len(security_tools) * 5
+        gap_penalty = len(gaps.split(',')) * 10 if gaps else 0
+        return max(0, min(100, base_score - tool_bonus + gap_penalty))
+    
+    @staticmethod
+    def calculate_compliance_risk(standards, last_audit):
+        base_score = 30
+        if not standards:
+            return 80
+        if last_audit:
+            days_since_audit = (datetime.now().date() - last_audit).days
+            if days_since_audit > 365:
+                base_score += 20
+        return max(0, min(100, base_score))
+    
+    @staticmethod
+    def calculate_breach_risk(breaches):
+        if not breaches or breaches == "None reported":
+            return 20
+        return 70
+    
+    @staticmethod
+    def calculate_overall_risk(scores):
+        weights = {
+            'network_risk_score': 0.25,
+            'endpoint_risk_score': 0.20,
+            'cloud_risk_score': 0.15,
+            'compliance_risk_score': 0.20,
+            'data_breach_risk_score': 0.20
+        }
+        total_score = sum(scores[key] * weights[key] for key in weights)
+        return round(total_score, 2)
+    
+    @staticmethod
+    def get_risk_level(score):
+        if score < 30:
+            return "Low"
+        elif score < 60:
+            return "Medium"
+        elif score < 80:
+            return "High"
+        else:
+            return "Critical"
+
+class AdvancedRiskCalculator:
+    """Advanced risk assessment with ML-like features and behavioral analysis"""
+    
+    @staticmethod
+    def calculate_behavioral_risk(vendor_data):
+        """Calculate behavioral risk based on vendor patterns"""
+        risk_factors = []
+        score = 50
+        
+        # Company size analysis
+        if vendor_data.get('employee_count') in ['1-10', '11-50']:
+            risk_factors.append('Small company with limited resources')
+            score += 15
+        
+        # Industry risk analysis
+        high_risk_industries = ['Financial Services', 'Healthcare', 'Technology']
+        if vendor_data.get('industry') in high_risk_industries:
+            risk_factors.append('High-value target industry')
+            score += 10
+        
+        # Data sensitivity analysis
+        sensitive_data_types = ['Personal Information', 'Financial Data', 'Health Records']
+        if vendor_data.get('data_processed'):
+            sensitive_count = sum(1 for data_type in vendor_data['data_processed'] 
+                                if data_type in sensitive_data_types)
+            if sensitive_count > 0:
+                risk_factors.append(f'Processes {sensitive_count} types of sensitive data')
+                score += sensitive_count * 8
+        
+        # Compliance maturity
+        if not vendor_data.get('compliance_frameworks') or 'None' in vendor_data.get('compliance_frameworks', []):
+            risk_factors.append('No formal compliance frameworks')
+            score += 20
+        
+        # Geographic risk (simulated)
+        if vendor_data.get('country') in ['Russia', 'China', 'North Korea']:
+            risk_factors.append('High-risk geographic location')
+            score += 25
+        
+        return {
+            'score': min(100, max(0, score)),
+            'risk_factors': risk_factors,
+            'risk_level': RiskCalculator.get_risk_level(score)
+        }
+    
+    @staticmethod
+    def calculate_geopolitical_risk(vendor_data):
+        """Calculate geopolitical risk factors"""
+        risk_factors = []
+        score = 30
+        
+        # Country risk mapping (simplified)
+        country_risk_scores = {
+            'United States': 20,
+            'Canada': 25,
+            'United Kingdom': 30,
+            'Germany': 35,
+            'France': 35,
+            'Japan': 30,
+            'Australia': 25,
+            'India': 50,
+            'China': 70,
+            'Russia': 80,
+            'Brazil': 45,
+            'Mexico': 55
+        }
+        
+        country = vendor_data.get('country', 'Unknown')
+        if country in country_risk_scores:
+            score += country_risk_scores[country]
+            if country_risk_scores[country] > 60:
+                risk_factors.append(f'High-risk country: {country}')
+        
+        # Regional instability factors
+        unstable_regions = ['Middle East', 'Eastern Europe', 'Southeast Asia']
+        if vendor_data.get('region') in unstable_regions:
+            risk_factors.append('Region with geopolitical instability')
+            score += 15
+        
+        return {
+            'score': min(100, max(0, score)),
+            'risk_factors': risk_factors,
+            'risk_level': RiskCalculator.get_risk_level(score)
+        }
+    
+    @staticmethod
+    def calculate_supply_chain_risk(vendor_data, vendor_history=None):
+        """Calculate supply chain dependency risk"""
+        risk_factors = []
+        score = 40
+        
+        # Dependency analysis
+        if vendor_data.get('industry') in ['Manufacturing', 'Technology']:
+            risk_factors.append('Critical supply chain dependency')
+            score += 20
+        
+        # Single source risk
+        if vendor_history and len(vendor_history) < 2:
+            risk_factors.append('Limited vendor alternatives')
+            score += 15
+        
+        # Financial stability indicators
+        if vendor_data.get('annual_revenue') in ['$1M-$10M', 'Less than $1M']:
+            risk_factors.append('Small company financial risk')
+            score += 10
+        
+        return {
+            'score': min(100, max(0, score)),
+            'risk_factors': risk_factors,
+            'risk_level': RiskCalculator.get_risk_level(score)
+        }
+    
+    @staticmethod
+    def calculate_ml_enhanced_risk(vendor_data, osint_data=None, noise=True):
+        """ML-enhanced risk calculation using multiple factors; noise=False for a reproducible score"""
+        features = []
+        
+        # Feature engineering
+        features.append(1 if vendor_data.get('employee_count') in ['1-10', '11-50'] else 0)  # Small company
+        features.append(1 if vendor_data.get('industry') in ['Financial Services', 'Healthcare'] else 0)  # High-value
+        features.append(len(vendor_data.get('data_processed', [])))  # Data types count
+        features.append(1 if not vendor_data.get('compliance_frameworks') else 0)  # No compliance
+        features.append(1 if osint_data and osint_data.get('dark_web_exposure', {}).get('exposed', False) else 0)  # Dark web
+        
+        # Simple ML-like scoring (in real implementation, use actual ML model)
+        weights = [0.25, 0.20, 0.15, 0.25, 0.15]
+        ml_score = sum(f * w for f, w in zip(features, weights)) * 100
+        
+        # Add noise for realistic variation
+        import random
+        if noise:
+            ml_score += random.uniform(-5, 5)
+        
+        return {
+            'score': min(100, max(0, ml_score)),
+            'features': features,
+            'confidence': random.uniform(0.7, 0.95),
+            'risk_level': RiskCalculator.get_risk_level(ml_score)
+        }
+    
+    @staticmethod
+    def generate_risk_recommendations(risk_analysis):
+        """Generate AI-powered risk recommendations"""
+        recommendations = []
+        
+        if risk_analysis.get('behavioral_risk', {}).get('score', 0) > 60:
+            recommendations.append({
+                'category': 'Behavioral Risk',
+                'priority': 'High',
+                'recommendation': 'Implement additional monitoring and controls for this vendor',
+                'action_items': [
+                    'Conduct quarterly security assessments',
+                    'Implement real-time monitoring',
+                    'Require additional security certifications'
+                ]
+            })
+        
+        if risk_analysis.get('geopolitical_risk', {}).get('score', 0) > 70:
+            recommendations.append({
+                'category': 'Geopolitical Risk',
+                'priority': 'Critical',
+                'recommendation': 'Consider vendor diversification due to geopolitical risks',
+                'action_items': [
+                    'Identify alternative vendors in lower-risk regions',
+                    'Implement enhanced due diligence',
+                    'Monitor geopolitical developments'
+                ]
+            })
+        
+        if risk_analysis.get('supply_chain_risk', {}).get('score', 0) > 50:
+            recommendations.append({
+                'category': 'Supply Chain Risk',
+                'priority': 'Medium',
+                'recommendation': 'Develop contingency plans for supply chain disruption',
+                'action_items': [
+                    'Identify backup vendors',
+                    'Increase inventory levels',
+                    'Diversify supply chain sources'
+                ]
+            })
+        
+        return recommendations
+
+def assess_vendor_batch(vendors: List[Tuple[int, str, Dict, Optional[Dict]]], deterministic: bool = False) -> List[Dict]:
+    """
+    Bulk risk assessment of a batch of vendors
+
+    Only takes plain data, so batches can be scored in worker processes.
+
+    Args:
+        vendors: (vendor_id, vendor_name, vendor_data, osint_data) per vendor, where
+            vendor_data has the fields calculate_behavioral_risk reads
+        deterministic: Leave out the random variation, so a vendor always gets the same score,
+            e.g. when the scores are stored
+
+    Returns:
+        One result per vendor in input order, with an "error" key when scoring failed
+    """
+    results = []
+    for vendor_id, vendor_name, vendor_data, osint_data in vendors:
+        try:
+            behavioral_risk = AdvancedRiskCalculator.calculate_behavioral_risk(vendor_data)
+            ml_enhanced_risk = AdvancedRiskCalculator.calculate_ml_enhanced_risk(vendor_data, osint_data,
+                                                                          noise=not deterministic)
+            
+            overall_score = (behavioral_risk['score'] + ml_enhanced_risk['score']) / 2
+            
+            results.append({
+                'vendor_id': vendor_id,
+                'vendor_name': vendor_name,
+                'risk_score': round(overall_score, 2),
+                'risk_level': RiskCalculator.get_risk_level(overall_score),
+                'assessment_date': datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            results.append({
+                'vendor_id': vendor_id,
+                'error': str(e)
+            })
+    return results
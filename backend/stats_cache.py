@@ -0,0 +1,59 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+class StatsCache:
+    """Thread-safe cache of computed aggregates, dropped wholesale on invalidate()
+
+    Entries also expire after a TTL, which bounds staleness for writes this
+    process never sees (other workers, direct SQL).
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        """
+        Args:
+            ttl: Seconds an entry is served before it is recomputed; 0 disables caching
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for key, computing and storing it when missing or expired
+
+        Args:
+            key: Cache key, e.g. the endpoint name
+            compute: Function producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+
+        # A write committed while computing may not be reflected, so don't keep the value
+        with self._lock:
+            if self.ttl > 0 and generation == self._generation:
+                self._entries[key] = (now, value)
+        return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when key is None"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -68,6 +68,12 @@ def test_osint_collector():
                 open_ports = port_scan.get('open_ports', [])
                 print(f"🔌 Open Ports: {open_ports}")
             
+            # Probe timings
+            timings = result.get('probe_timings', {})
+            if timings:
+                slowest = max(timings, key=timings.get)
+                print(f"⏱️  Collection time: {result.get('collection_duration', 'N/A')}s (slowest probe: {slowest} {timings[slowest]}s)")
+            
             print("✅ Collection completed successfully")
             
         except Exception as e:
@@ -0,0 +1,214 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from marshmallow import ValidationError, fields, validate
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Separator of the values of a list column in a CSV cell, e.g. "SOC 2;ISO 27001"
+CSV_LIST_SEPARATOR = ";"
+
+class ImportFormatError(ValueError):
+    """An import body that cannot be read as the declared format"""
+
+def import_format(content_type: Optional[str], requested: Optional[str] = None,
+                  filename: Optional[str] = None) -> Optional[str]:
+    """
+    Format of an import body: an explicit ?format= wins, then the Content-Type,
+    then the extension of an uploaded file
+
+    Returns:
+        "csv", "ndjson", or None when none of them names a supported format
+    """
+    if requested:
+        requested = requested.lower()
+        return requested if requested in IMPORT_FORMATS else None
+    mimetype = (content_type or "").split(";")[0].strip().lower()
+    if mimetype in ("text/csv", "application/csv"):
+        return "csv"
+    if mimetype in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "ndjson"
+    extension = (filename or "").rpartition(".")[2].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    return None
+
+def iter_import_rows(stream, fmt: str, list_fields: Sequence[str] = ()) -> Iterator[Tuple[int, Optional[Dict], Optional[Dict]]]:
+    """
+    Read an import body record by record, without loading it whole
+
+    CSV needs a header row; empty cells are left out of the record and list
+    columns are split on CSV_LIST_SEPARATOR. NDJSON holds one JSON object per
+    line; blank lines are skipped.
+
+    Args:
+        stream: Binary file-like body, UTF-8 encoded
+        fmt: "csv" or "ndjson"
+        list_fields: Columns holding lists of strings
+
+    Yields:
+        (row number, record, None) for a readable record, or
+        (row number, None, errors) for one that is not
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+    try:
+        if fmt == "csv":
+            yield from _iter_csv_rows(text, list_fields)
+        else:
+            yield from _iter_ndjson_rows(text)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"Import body is not valid UTF-8: {e}") from e
+    except csv.Error as e:
+        raise ImportFormatError(f"Malformed CSV: {e}") from e
+    finally:
+        # The stream belongs to the caller
+        text.detach()
+
+def _iter_csv_rows(text, list_fields):
+    reader = csv.DictReader(text, restkey="_extra_columns")
+    if not reader.fieldnames:
+        raise ImportFormatError("CSV import needs a header row")
+    for row_number, row in enumerate(reader, start=1):
+        record = {}
+        for key, value in row.items():
+            if key is None or value is None or value == "":
+                continue
+            key = key.strip()
+            if key in list_fields:
+                value = [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+            record[key] = value
+        yield row_number, record, None
+
+def _iter_ndjson_rows(text):
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, {"_row": [f"Invalid JSON: {e.msg}"]}
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, {"_row": ["Expected a JSON object"]}
+            continue
+        yield row_number, record, None
+
+class FastRowValidator:
+    """Validate import rows against a marshmallow schema with a cheap fast path
+
+    The fast path accepts a row only when every value is a plain string (or
+    list of strings) that passes the schema's own Length, OneOf and Email
+    validators, which the schema would accept unchanged. The rules are read
+    off the schema's fields; a field with any other type or validator always
+    takes the slow path. Any row the fast path does not accept goes through
+    schema.load, so accepted rows are the same either way and rejected rows
+    get the schema's own messages. Schema-level hooks and validators are not
+    seen by the fast path, so schemas using them should not be used here.
+    """
+
+    def __init__(self, schema):
+        """
+        Args:
+            schema: Marshmallow schema instance; the source of the rules and the fallback
+        """
+        self.schema = schema
+        self.known = frozenset(schema.fields)
+        self.required = frozenset(name for name, field in schema.fields.items() if field.required)
+        self.lengths = {}
+        self.choices = {}
+        self.emails = {}
+        self.list_fields = set()
+        self.opaque_fields = set()
+        for name, field in schema.fields.items():
+            self._read_field_rules(name, field)
+        self.fast = 0
+        self.fallback = 0
+
+    def _read_field_rules(self, name, field):
+        if field.data_key not in (None, name) or field.attribute not in (None, name):
+            self.opaque_fields.add(name)
+        elif isinstance(field, fields.List):
+            inner = field.inner
+            if type(inner) is fields.String and not inner.validators and not field.validators:
+                self.list_fields.add(name)
+            else:
+                self.opaque_fields.add(name)
+        elif not isinstance(field, fields.String):
+            self.opaque_fields.add(name)
+        else:
+            for validator in field.validators:
+                if type(validator) is validate.Length and name not in self.lengths:
+                    if validator.equal is not None:
+                        self.lengths[name] = (validator.equal, validator.equal)
+                    else:
+                        self.lengths[name] = (validator.min or 0, validator.max)
+                elif type(validator) is validate.OneOf and name not in self.choices:
+                    self.choices[name] = frozenset(validator.choices)
+                elif type(validator) is validate.Email and name not in self.emails:
+                    self.emails[name] = validator
+                else:
+                    self.opaque_fields.add(name)
+                    return
+
+    def validate(self, row: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """(validated row, None) for an accepted row, (None, error messages) otherwise"""
+        if self._fast_accepts(row):
+            self.fast += 1
+            return row, None
+        self.fallback += 1
+        try:
+            return self.schema.load(row), None
+        except ValidationError as e:
+            return None, e.messages
+
+    def _fast_accepts(self, row):
+        if not self.required.issubset(row) or not self.known.issuperset(row) or not self.opaque_fields.isdisjoint(row):
+            return False
+        for field, value in row.items():
+            if field in self.list_fields:
+                if type(value) is not list or not all(type(item) is str for item in value):
+                    return False
+                continue
+            if type(value) is not str:
+                return False
+            if field in self.lengths:
+                low, high = self.lengths[field]
+                if len(value) < low or (high is not None and len(value) > high):
+                    return False
+            if field in self.choices and value not in self.choices[field]:
+                return False
+            if field in self.emails and not self._plain_email(self.emails[field], value):
+                return False
+        return True
+
+    @staticmethod
+    def _plain_email(validator, value):
+        # Marshmallow's own patterns; addresses needing IDNA conversion take the slow path
+        user, at, domain = value.rpartition("@")
+        return bool(at and validator.USER_REGEX.match(user)
+                    and (domain in validator.DOMAIN_WHITELIST or validator.DOMAIN_REGEX.match(domain)))
+
+def copy_text_value(value: Any) -> str:
+    """A value in PostgreSQL COPY text format; JSON columns are written as JSON"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    elif not isinstance(value, str):
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def copy_text_rows(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> io.StringIO:
+    """Rows as a COPY ... FROM STDIN text-format buffer"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_text_value(row.get(column)) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
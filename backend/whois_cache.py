@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import whois
+
+logger = logging.getLogger(__name__)
+
+# WHOIS data changes rarely, so cached records are kept for a week
+DEFAULT_WHOIS_TTL = 7 * 24 * 3600
+
+# Minimum seconds between two lookups against the same TLD's WHOIS server
+DEFAULT_TLD_INTERVAL = 1.0
+
+# WHOIS queries running at once per queue
+DEFAULT_WHOIS_WORKERS = 4
+
+def fetch_whois_record(domain: str) -> Dict:
+    """Query WHOIS for a domain and keep the fields the collector reports"""
+    w = whois.whois(domain)
+
+    return {
+        "registrar": w.registrar,
+        "creation_date": str(w.creation_date) if w.creation_date else None,
+        "expiration_date": str(w.expiration_date) if w.expiration_date else None,
+        "updated_date": str(w.updated_date) if w.updated_date else None,
+        "name_servers": w.name_servers if w.name_servers else [],
+        "status": w.status if w.status else [],
+        "emails": w.emails if w.emails else [],
+        "org": w.org if w.org else None,
+        "country": w.country if w.country else None
+    }
+
+class WhoisCache:
+    """Persistent WHOIS record cache stored in a SQLite file, safe to share between processes"""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_WHOIS_TTL):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds a cached record stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS whois_cache ("
+            "domain TEXT PRIMARY KEY, record TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, domain: str) -> Optional[Dict]:
+        """Cached record for a domain, or None when missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record, fetched_at FROM whois_cache WHERE domain = ?", (domain,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, domain: str, record: Dict) -> None:
+        """Store or replace the record for a domain"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO whois_cache (domain, record, fetched_at) VALUES (?, ?, ?)",
+                (domain, json.dumps(record, default=str), time.time())
+            )
+            self._conn.commit()
+
+class WhoisLookupQueue:
+    """WHOIS lookups through the persistent cache, rate limited per TLD
+
+    Cache misses for the same TLD are serialized and spaced at least the
+    TLD's interval apart, so bulk scans stay under registry throttles.
+    Concurrent lookups of the same domain share a single query. Queries run
+    on the queue's own threads, so a caller can stop waiting at its deadline
+    while the query finishes and fills the cache for the next lookup.
+    """
+
+    def __init__(self, cache: Optional[WhoisCache] = None, default_interval: float = DEFAULT_TLD_INTERVAL,
+                 tld_intervals: Optional[Dict[str, float]] = None,
+                 fetch: Callable[[str], Dict] = fetch_whois_record, max_workers: int = DEFAULT_WHOIS_WORKERS):
+        """
+        Args:
+            cache: Persistent record cache; lookups always go to WHOIS when None
+            default_interval: Minimum seconds between lookups for TLDs without an override
+            tld_intervals: Per-TLD interval overrides, e.g. {"de": 5.0}
+            fetch: Function performing the actual WHOIS query
+            max_workers: WHOIS queries running at once
+        """
+        self.cache = cache
+        self.default_interval = default_interval
+        self.tld_intervals = tld_intervals or {}
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._tld_locks = {}
+        self._tld_next_allowed = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="whois")
+
+    def lookup(self, domain: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Get the WHOIS record for a domain
+
+        Args:
+            domain: Normalized domain
+            timeout: Seconds to wait for the record; None waits until the query ends
+
+        Returns:
+            WHOIS record; raises if the lookup fails, or concurrent.futures.TimeoutError
+            when it does not finish in time
+        """
+        if self.cache is not None:
+            record = self.cache.get(domain)
+            if record is not None:
+                return record
+
+        # A query already running for this domain is shared
+        with self._lock:
+            future = self._in_flight.get(domain)
+            submitted = future is None
+            if submitted:
+                future = self._executor.submit(self._fetch_and_store, domain)
+                self._in_flight[domain] = future
+        if submitted:
+            future.add_done_callback(lambda done: self._forget(domain, done))
+
+        return future.result(timeout=timeout)
+
+    def _fetch_and_store(self, domain: str) -> Dict:
+        record = self._rate_limited_fetch(domain)
+        if self.cache is not None:
+            self.cache.put(domain, record)
+        return record
+
+    def _forget(self, domain: str, future) -> None:
+        with self._lock:
+            if self._in_flight.get(domain) is future:
+                del self._in_flight[domain]
+
+    def _rate_limited_fetch(self, domain: str) -> Dict:
+        tld = domain.rsplit('.', 1)[-1]
+
+        with self._lock:
+            tld_lock = self._tld_locks.setdefault(tld, threading.Lock())
+
+        # Holding the TLD lock makes waiting callers queue up behind each other
+        with tld_lock:
+            delay = self._tld_next_allowed.get(tld, 0) - time.monotonic()
+            if delay > 0:
+                logger.info(f"Waiting {delay:.2f}s for WHOIS rate limit on .{tld}")
+                time.sleep(delay)
+            try:
+                return self.fetch(domain)
+            finally:
+                interval = self.tld_intervals.get(tld, self.default_interval)
+                self._tld_next_allowed[tld] = time.monotonic() + interval
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+def get_default_whois_queue() -> WhoisLookupQueue:
+    """Process-wide WHOIS queue backed by the cache file in WHOIS_CACHE_PATH"""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            path = os.getenv('WHOIS_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'scope_whois_cache.sqlite3'))
+            _default_queue = WhoisLookupQueue(
+                cache=WhoisCache(path),
+                default_interval=float(os.getenv('WHOIS_TLD_INTERVAL', DEFAULT_TLD_INTERVAL))
+            )
+        return _default_queue